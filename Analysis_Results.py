@@ -0,0 +1,246 @@
+import json
+import sys
+
+import numpy as np
+
+from Dominance_and_Rationalizability import IteratedDominance
+from Mixed_Strategies_and_Expected_Payoffs import expected_payoffs
+from Nash_Equilibrium_Computation_and_Output import best_response_mask, find_nash_equilibria_tensor
+from Payoff_Tensor import default_labels, df_to_tensor
+
+# Silent, structured results for the dominance, best response, Nash and
+# expected payoff routines. Every finding is a small __slots__ record and
+# analyse() bundles all of them for one game into a GameAnalysis; nothing is
+# printed. Rendering is left to the reporter functions at the bottom, which
+# write any number of analyses as text or JSON Lines in a single write.
+#
+# Players are numbered from 1 in records, as in check_dominance; strategies
+# are given by their labels.
+
+
+class Record:
+    __slots__ = ()
+    kind = None
+
+    def as_dict(self):
+        return {'kind': self.kind, **{name: getattr(self, name) for name in self.__slots__}}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Domination(Record):
+    # `strategy` is dominated by every strategy in `dominated_by`
+    __slots__ = ('player', 'strategy', 'dominated_by', 'mode')
+    kind = 'domination'
+
+    def __init__(self, player, strategy, dominated_by, mode):
+        self.player = player
+        self.strategy = strategy
+        self.dominated_by = dominated_by
+        self.mode = mode
+
+
+class Elimination(Record):
+    __slots__ = ('round', 'player', 'strategy', 'mode')
+    kind = 'elimination'
+
+    def __init__(self, round, player, strategy, mode):
+        self.round = round
+        self.player = player
+        self.strategy = strategy
+        self.mode = mode
+
+
+class BestResponse(Record):
+    # Player's best responses to one strategy (two players) or one profile of
+    # the other players' strategies (N players)
+    __slots__ = ('player', 'against', 'responses')
+    kind = 'best_response'
+
+    def __init__(self, player, against, responses):
+        self.player = player
+        self.against = against
+        self.responses = responses
+
+
+class Equilibrium(Record):
+    __slots__ = ('profile', 'payoffs')
+    kind = 'equilibrium'
+
+    def __init__(self, profile, payoffs):
+        self.profile = profile
+        self.payoffs = payoffs
+
+
+class ExpectedPayoff(Record):
+    __slots__ = ('player', 'value')
+    kind = 'expected_payoff'
+
+    def __init__(self, player, value):
+        self.player = player
+        self.value = value
+
+
+class GameAnalysis:
+    __slots__ = ('name', 'labels', 'dominated', 'eliminations', 'rationalizable',
+                 'best_responses', 'equilibria', 'expected_payoffs')
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.dominated = []
+        self.eliminations = []
+        self.rationalizable = None
+        self.best_responses = []
+        self.equilibria = []
+        self.expected_payoffs = []
+
+    def records(self):
+        yield from self.dominated
+        yield from self.eliminations
+        yield from self.best_responses
+        yield from self.equilibria
+        yield from self.expected_payoffs
+
+
+def _as_game(game):
+    # (payoffs, labels) from a tuple-cell DataFrame, a (payoffs, labels) pair
+    # or a bare payoff tensor
+    if hasattr(game, 'columns'):
+        return df_to_tensor(game)
+    if isinstance(game, tuple):
+        payoffs, labels = game
+        return np.asarray(payoffs), labels
+    payoffs = np.asarray(game)
+    return payoffs, default_labels(payoffs.shape[:-1])
+
+
+def _value(x):
+    return x.item() if isinstance(x, np.generic) else x
+
+
+def dominance(payoffs, labels, modes=('strict', 'weak'), engine=None):
+    # Domination records of both players in a two player game, before any
+    # elimination
+    if engine is None:
+        engine = IteratedDominance(payoffs)
+    records = []
+    for mode in modes:
+        for player_index in (0, 1):
+            dominates = engine.dominators(player_index, mode)
+            own = labels[player_index]
+            for s in np.flatnonzero(dominates.any(axis=1)).tolist():
+                by = [own[t] for t in np.flatnonzero(dominates[s]).tolist()]
+                records.append(Domination(player_index + 1, own[s], by, mode))
+    return records
+
+
+def elimination(payoffs, labels, weak=True, engine=None):
+    # (elimination records in order, rationalizable labels per player)
+    if engine is None:
+        engine = IteratedDominance(payoffs)
+    alive = engine.run(weak=weak)
+    records = [
+        Elimination(round, player_index + 1, labels[player_index][s], mode)
+        for round, player_index, s, mode in engine.eliminated
+    ]
+    rationalizable = [[labels[i][s] for s in np.flatnonzero(mask).tolist()] for i, mask in enumerate(alive)]
+    return records, rationalizable
+
+
+def best_response_map(payoffs, labels):
+    payoffs = np.asarray(payoffs)
+    shape = payoffs.shape[:-1]
+    records = []
+    for i in range(len(shape)):
+        others = [j for j in range(len(shape)) if j != i]
+        # One row per profile of the other players, in C order over `others`
+        mask = np.moveaxis(best_response_mask(payoffs, i), i, -1).reshape(-1, shape[i])
+        for row, index in zip(mask, np.ndindex(*(shape[j] for j in others))):
+            against = tuple(labels[j][a] for j, a in zip(others, index))
+            records.append(BestResponse(i + 1, against[0] if len(against) == 1 else against,
+                                        [labels[i][a] for a in np.flatnonzero(row).tolist()]))
+    return records
+
+
+def equilibria(payoffs, labels):
+    payoffs = np.asarray(payoffs)
+    return [
+        Equilibrium(tuple(labels[i][a] for i, a in enumerate(profile)),
+                    tuple(_value(x) for x in payoffs[tuple(profile)]))
+        for profile in find_nash_equilibria_tensor(payoffs).tolist()
+    ]
+
+
+def expected_payoff_records(payoffs, labels, mixed):
+    # mixed holds one probability vector, or one {label: probability} dict as
+    # taken by calculate_N_payoffs, per player
+    probs = [
+        [strategy.get(label, 0.0) for label in labels[i]] if isinstance(strategy, dict) else strategy
+        for i, strategy in enumerate(mixed)
+    ]
+    values = expected_payoffs(payoffs, probs)
+    return [ExpectedPayoff(i + 1, float(v)) for i, v in enumerate(values.tolist())]
+
+
+def analyse(game, mixed=None, name=None, weak=True):
+    # Full analysis of one game. Dominance and elimination are only defined
+    # for two players and are left empty otherwise.
+    payoffs, labels = _as_game(game)
+    result = GameAnalysis(name, labels)
+    if payoffs.ndim == 3:
+        engine = IteratedDominance(payoffs)
+        result.dominated = dominance(payoffs, labels, engine=engine)
+        result.eliminations, result.rationalizable = elimination(payoffs, labels, weak, engine=engine)
+    result.best_responses = best_response_map(payoffs, labels)
+    result.equilibria = equilibria(payoffs, labels)
+    if mixed is not None:
+        result.expected_payoffs = expected_payoff_records(payoffs, labels, mixed)
+    return result
+
+
+def _text(record):
+    if record.kind == 'domination':
+        relation = "strictly" if record.mode == 'strict' else "weakly"
+        by = ", ".join(map(str, record.dominated_by))
+        return f"{record.strategy} is {relation} dominated by {by} (Player {record.player})"
+    if record.kind == 'elimination':
+        return f"Round {record.round}: eliminated {record.strategy} ({record.mode}, Player {record.player})"
+    if record.kind == 'best_response':
+        return f"Player {record.player} best responses to {record.against}: {record.responses}"
+    if record.kind == 'equilibrium':
+        return f"Nash equilibrium {record.profile} with payoffs {record.payoffs}"
+    return f"Expected Payoff (Player {record.player}): {record.value}"
+
+
+def format_text(analysis):
+    lines = [f"== {analysis.name} ==" if analysis.name is not None else "=="]
+    lines.extend(_text(record) for record in analysis.records())
+    if analysis.rationalizable is not None:
+        for i, strategies in enumerate(analysis.rationalizable):
+            lines.append(f"Rationalizable (Player {i + 1}): {strategies}")
+    return "\n".join(lines)
+
+
+def write_text(analyses, file=None):
+    file = sys.stdout if file is None else file
+    file.write("\n\n".join(format_text(analysis) for analysis in analyses) + "\n")
+
+
+def write_jsonl(analyses, file=None):
+    # One JSON object per record, tagged with the game's position and name
+    file = sys.stdout if file is None else file
+    lines = []
+    for index, analysis in enumerate(analyses):
+        game = {'game': index, 'name': analysis.name}
+        for record in analysis.records():
+            lines.append(json.dumps({**game, **record.as_dict()}, default=str))
+        if analysis.rationalizable is not None:
+            lines.append(json.dumps({**game, 'kind': 'rationalizable', 'strategies': analysis.rationalizable}, default=str))
+    if lines:
+        file.write("\n".join(lines) + "\n")
@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Dominance_and_Rationalizability import IteratedDominance
+from Mixed_Strategies_and_Expected_Payoffs import expected_payoffs
+from Nash_Equilibrium_Computation_and_Output import best_response_mask, find_nash_equilibria_tensor
+from Payoff_Tensor import df_to_tensor
+
+# Parallel driver running many independent two player games through the
+# notebook pipeline: dominance, best responses, rationalizable strategies,
+# mixed expected payoffs and pure Nash equilibria.
+#
+# All payoff tensors are packed once into a single multiprocessing
+# shared_memory block; worker processes attach to it on start and each task
+# only carries (game index, offset, shape), so payoffs are never pickled.
+# Results are yielded as games complete, with the solve time measured in the
+# worker.
+
+_shared = None
+_buffer = None
+
+
+def _attach(name, size):
+    global _shared, _buffer
+    # Workers share the parent's resource tracker, which unlinks the block
+    # once when the parent calls unlink()
+    _shared = shared_memory.SharedMemory(name=name)
+    _buffer = np.ndarray((size,), dtype=np.float64, buffer=_shared.buf)
+
+
+def analyse_game(payoffs, mixed=None):
+    # Full pipeline for one (n1, n2, 2) tensor; results are in strategy indices
+    engine = IteratedDominance(payoffs)
+    dominated = {
+        mode: [engine.dominated(i, mode).tolist() for i in (0, 1)]
+        for mode in ('strict', 'weak')
+    }
+    best = [best_response_mask(payoffs, i) for i in (0, 1)]
+    alive_rows, alive_cols = engine.run()
+
+    if mixed is None:
+        mixed = [np.full(n, 1.0 / n) for n in payoffs.shape[:-1]]
+    equilibria = find_nash_equilibria_tensor(payoffs)
+
+    return {
+        'dominated': dominated,
+        # best response rows for every column, columns for every row
+        'best_responses': [
+            [np.flatnonzero(best[0][:, c]).tolist() for c in range(payoffs.shape[1])],
+            [np.flatnonzero(best[1][r]).tolist() for r in range(payoffs.shape[0])],
+        ],
+        'rationalizable': [np.flatnonzero(alive_rows).tolist(), np.flatnonzero(alive_cols).tolist()],
+        'expected_payoffs': expected_payoffs(payoffs, mixed).tolist(),
+        'nash_equilibria': [tuple(e) for e in equilibria.tolist()],
+    }
+
+
+def _solve_shared(tasks):
+    # Solve a chunk of (index, offset, shape, mixed) tasks from shared memory
+    results = []
+    for index, offset, shape, mixed in tasks:
+        start = time.perf_counter()
+        size = int(np.prod(shape))
+        payoffs = _buffer[offset:offset + size].reshape(shape)
+        result = analyse_game(payoffs, mixed)
+        result['seconds'] = time.perf_counter() - start
+        results.append((index, result))
+    return results
+
+
+def _as_tensor(game):
+    if isinstance(game, tuple):
+        return np.asarray(game[0], dtype=np.float64)
+    if hasattr(game, 'columns'):
+        return np.asarray(df_to_tensor(game)[0], dtype=np.float64)
+    return np.asarray(game, dtype=np.float64)
+
+
+def solve_batch(games, workers=None, mixed=None, chunksize=8):
+    # Generator over (game index, result dict) in completion order. `games` may
+    # hold payoff tensors, tuple-cell DataFrames or (payoffs, labels) pairs;
+    # mixed is an optional list with one list of probability vectors per game.
+    # Games are submitted in chunks of `chunksize` to amortize task overhead.
+    tensors = [_as_tensor(game) for game in games]
+    offsets = np.cumsum([0] + [t.size for t in tensors])
+    total = int(offsets[-1])
+    tasks = [
+        (i, int(offsets[i]), tensor.shape, None if mixed is None else mixed[i])
+        for i, tensor in enumerate(tensors)
+    ]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+    buffer = None
+    try:
+        buffer = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+        for tensor, offset in zip(tensors, offsets):
+            buffer[offset:offset + tensor.size] = tensor.ravel()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shm.name, total)) as pool:
+            futures = [
+                pool.submit(_solve_shared, tasks[start:start + chunksize])
+                for start in range(0, len(tasks), chunksize)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        buffer = None
+        shm.close()
+        shm.unlink()
+
+
+def solve_all(games, workers=None, mixed=None, chunksize=8):
+    # Results in input order plus the wall time of the whole batch
+    start = time.perf_counter()
+    results = [None] * len(games)
+    for index, result in solve_batch(games, workers, mixed, chunksize):
+        results[index] = result
+    return results, time.perf_counter() - start
@@ -1,8 +1,10 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import sys
 sys.dont_write_bytecode = True
 
+from Instrumentation import count, phase
+from Payoff_Tensor import df_to_tensor
+
 # Define the payoff matrix for Prisoner's Dilemma
 # strategies_p1 = ['C', 'D']
 # strategies_p2 = ['C', 'D']
@@ -18,12 +20,21 @@ sys.dont_write_bytecode = True
 # df = pd.DataFrame([[payoff_matrix[(r, c)] for c in strategies_p2] for r in strategies_p1], index=strategies_p1, columns=strategies_p2)
 
 
-def print_payoff_matrix(df):
+def print_payoff_matrix(df, show_plot=True, output=None):
     print("Payoff Matrix (Player 1 payoff, Player 2 payoff):")
     formatted = df.apply(lambda col: col.map(str))
     print(formatted.to_string())
     print()
 
+    if output is not None:
+        # Headless render to a file instead of opening a window
+        from Rendering import render_payoff_table
+        render_payoff_table(df, "Prisoner's Dilemma Payoff Matrix", output=output)
+        return
+    if not show_plot:
+        return
+    import matplotlib.pyplot as plt
+
     # Display nicely formatted table using matplotlib
     fig, ax = plt.subplots()
     ax.axis('off')
@@ -47,44 +58,135 @@ def print_payoff_matrix(df):
     plt.show()
 
 
-def check_dominance(player, df, mode='strict', ignore_strategies=None):
+def _own_payoffs(payoffs, player):
+    # Player's payoffs as an (own strategies, opponent strategies) matrix
+    return payoffs[..., 0] if player == 1 else payoffs[..., 1].T
+
+
+def _beats_counts(M, columns=None, block_bytes=2**24):
+    # counts[s, t] = number of opponent strategies (restricted to `columns`)
+    # where own strategy t pays strictly more than s. Built in row blocks so
+    # the (block, n, m) comparison stays under block_bytes.
+    if columns is not None:
+        M = M[:, columns]
+    n, m = M.shape
+    counts = np.empty((n, n), dtype=np.int32)
+    block = max(1, block_bytes // max(n * m, 1))
+    for start in range(0, n, block):
+        rows = M[start:start + block, None, :]
+        counts[start:start + block] = np.count_nonzero(M[None, :, :] > rows, axis=2)
+    return counts
+
+
+def _dominates(beats, n_other, mode):
+    # dominates[s, t]: own strategy t dominates s, from the beats relation
+    if mode == 'strict':
+        dominates = beats == n_other
+    elif mode == 'weak':
+        dominates = (beats.T == 0) & (beats > 0)
+    else:
+        dominates = np.zeros_like(beats, dtype=bool)
+    np.fill_diagonal(dominates, False)
+    return dominates
+
+
+def check_dominance(player, df, mode='strict', ignore_strategies=None, verbose=False):
+    # Set of player's dominated strategies; verbose=True prints each finding.
+    # Analysis_Results.dominance gives the same findings as records.
     if ignore_strategies is None:
         ignore_strategies = set()
 
-    strategies = df.index if player == 1 else df.columns
+    with phase('check_dominance.to_tensor'):
+        payoffs, labels = df_to_tensor(df)
+    strategies = labels[player - 1]
+    M = _own_payoffs(payoffs, player)
+    with phase('check_dominance.relation'):
+        beats = _beats_counts(M)
+    n_other = M.shape[1]
+    count('check_dominance.comparisons', M.shape[0] * (M.shape[0] - 1) * n_other)
+
+    dominates = _dominates(beats, n_other, mode)
+
     dominated = set()
     relation = "strictly" if mode == 'strict' else "weakly"
-
-    for s1 in strategies:
+    for s in np.flatnonzero(dominates.any(axis=1)):
+        s1 = strategies[s]
         if s1 in ignore_strategies:
             continue  # Skip already dominated strategies
+        if verbose:
+            s2 = strategies[np.argmax(dominates[s])]
+            print(f"{s1} is {relation} dominated by {s2} (Player {player})")
+            count('check_dominance.lines_printed')
+        dominated.add(s1)
 
-        for s2 in strategies:
-            if s1 == s2:
-                continue
+    return dominated
 
-            if player == 1:
-                s1_payoffs = [df.loc[s1, c][0] for c in df.columns]
-                s2_payoffs = [df.loc[s2, c][0] for c in df.columns]
-            else:
-                s1_payoffs = [df.loc[r, s1][1] for r in df.index]
-                s2_payoffs = [df.loc[r, s2][1] for r in df.index]
 
-            if mode == 'strict':
-                if all(p2 > p1 for p1, p2 in zip(s1_payoffs, s2_payoffs)):
-                    print(f"{s1} is {relation} dominated by {s2} (Player {player})")
-                    dominated.add(s1)
-                    break
-            elif mode == 'weak':
-                if all(p2 >= p1 for p1, p2 in zip(s1_payoffs, s2_payoffs)) and any(p2 > p1 for p1, p2 in zip(s1_payoffs, s2_payoffs)):
-                    print(f"{s1} is {relation} dominated by {s2} (Player {player})")
-                    dominated.add(s1)
+class IteratedDominance:
+    # Iterated elimination of dominated strategies on a (n1, n2, 2) payoff
+    # tensor. Each player keeps a boolean alive-mask and a cached pairwise
+    # relation beats[s, t] (opponent strategies where t pays more than s),
+    # from which both strict dominance (beats[s, t] == alive opponents) and
+    # weak dominance (beats[t, s] == 0 < beats[s, t]) are read. Removing
+    # opponent strategies only subtracts the removed columns' contribution.
+
+    def __init__(self, payoffs):
+        payoffs = np.asarray(payoffs)
+        self.matrices = [_own_payoffs(payoffs, 1), _own_payoffs(payoffs, 2)]
+        self.alive = [np.ones(payoffs.shape[0], dtype=bool), np.ones(payoffs.shape[1], dtype=bool)]
+        with phase('dominance.init_relation'):
+            self.beats = [_beats_counts(M) for M in self.matrices]
+        count('dominance.comparisons', sum(M.shape[0] ** 2 * M.shape[1] for M in self.matrices))
+        self.rounds = 0
+        # (round, player index, strategy index, mode) for every removal
+        self.eliminated = []
+
+    def dominators(self, player_index, mode='strict'):
+        # dominates[s, t]: alive strategy t dominates alive strategy s, given
+        # the opponent strategies still alive
+        alive = self.alive[player_index]
+        n_alive_other = np.count_nonzero(self.alive[1 - player_index])
+        dominates = _dominates(self.beats[player_index], n_alive_other, mode)
+        dominates &= alive[None, :]
+        dominates &= alive[:, None]
+        return dominates
+
+    def dominated(self, player_index, mode='strict'):
+        return np.flatnonzero(self.dominators(player_index, mode).any(axis=1))
+
+    def remove(self, player_index, strategies, mode='strict'):
+        strategies = np.asarray(strategies, dtype=np.intp)
+        if strategies.size == 0:
+            return
+        self.alive[player_index][strategies] = False
+        for s in strategies.tolist():
+            self.eliminated.append((self.rounds, player_index, s, mode))
+        # The opponent's relation loses the removed strategies as columns
+        other = 1 - player_index
+        with phase('dominance.update_relation'):
+            self.beats[other] -= _beats_counts(self.matrices[other], strategies)
+        count('dominance.eliminated', strategies.size)
+        count('dominance.comparisons', self.matrices[other].shape[0] ** 2 * strategies.size)
+
+    def run(self, weak=True):
+        # Same order as rationalizable_strategies: remove all strictly dominated
+        # strategies of both players at once, fall back to weak dominance only
+        # when nothing is strictly dominated, and repeat until stable.
+        while True:
+            self.rounds += 1
+            count('dominance.rounds')
+            for mode in (('strict', 'weak') if weak else ('strict',)):
+                found = [self.dominated(0, mode), self.dominated(1, mode)]
+                if found[0].size or found[1].size:
+                    self.remove(0, found[0], mode)
+                    self.remove(1, found[1], mode)
                     break
-
-    return dominated
-
+            else:
+                self.rounds -= 1
+                return self.alive
 
 def best_responses(player, df):
+    count('best_responses.cells_visited', df.shape[0] * df.shape[1])
     best_resp = {}
     if player == 1:
         for col in df.columns:
@@ -99,44 +201,143 @@ def best_responses(player, df):
     return best_resp
 
 
-def rationalizable_strategies(df):
-    df_rat = df.copy()
-    while True:
-        strict_dom_p1 = check_dominance(1, df_rat, 'strict')
-        strict_dom_p2 = check_dominance(2, df_rat, 'strict')
-
-        if strict_dom_p1 or strict_dom_p2:
-            if strict_dom_p1:
-                df_rat = df_rat.drop(index=strict_dom_p1)
-            if strict_dom_p2:
-                df_rat = df_rat.drop(columns=strict_dom_p2)
-            continue
-
-        weak_dom_p1 = check_dominance(1, df_rat, 'weak', ignore_strategies=strict_dom_p1)
-        weak_dom_p2 = check_dominance(2, df_rat, 'weak', ignore_strategies=strict_dom_p2)
-
-        if weak_dom_p1 or weak_dom_p2:
-            if weak_dom_p1:
-                df_rat = df_rat.drop(index=weak_dom_p1)
-            if weak_dom_p2:
-                df_rat = df_rat.drop(columns=weak_dom_p2)
-            continue
-
-        break
-
-    return df_rat
+def _mixed_domination_lp(M, s, others, columns):
+    # Strict dominance of own strategy s by a mixture over `others`, on the
+    # opponent strategies in `columns`:
+    #   maximize eps  s.t.  sum_t p_t M[t, c] >= M[s, c] + eps,  sum p = 1,  p >= 0
+    # s is dominated iff eps > 0. Returns (eps, p over others, q over columns)
+    # where q (the constraint duals) is a belief against which s does at least
+    # as well as every mixture when s is not dominated.
+    from scipy.optimize import linprog
+
+    k = len(others)
+    sub = M[np.ix_(others, columns)].T
+    c = np.zeros(k + 1)
+    c[-1] = -1.0
+    A_ub = np.hstack([-sub, np.ones((len(columns), 1))])
+    b_ub = -M[s, columns]
+    A_eq = np.ones((1, k + 1))
+    A_eq[0, -1] = 0.0
+    bounds = [(0, None)] * k + [(None, None)]
+    res = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0], bounds=bounds, method='highs')
+    if res.status != 0:
+        raise RuntimeError(f"dominance LP failed for strategy {s}: {res.message}")
+    return -res.fun, res.x[:k], -res.ineqlin.marginals
+
+
+_worker_matrices = None
+
+
+def _init_dominance_worker(matrices):
+    global _worker_matrices
+    _worker_matrices = matrices
+
+
+def _solve_dominance_batch(player_index, tasks):
+    M = _worker_matrices[player_index]
+    return [(s, _mixed_domination_lp(M, s, others, columns)) for s, others, columns in tasks]
+
+
+def iterated_mixed_dominance(payoffs, workers=1, tol=1e-9, chunk=16):
+    # Iterated elimination of pure strategies strictly dominated by mixed
+    # strategies, one LP per candidate. Results are warm-started across rounds
+    # through certificates: a dominating mixture stays valid while its support
+    # is alive, and the dual belief q of an undominated strategy stays valid
+    # while its support is alive, since removals only shrink both sides. Only
+    # strategies whose certificate was invalidated are re-solved, in parallel
+    # on a process pool when workers > 1.
+    # Returns the alive masks and the (round, player index, strategy, mixture)
+    # elimination log.
+    payoffs = np.asarray(payoffs, dtype=float)
+    matrices = [_own_payoffs(payoffs, 1), _own_payoffs(payoffs, 2)]
+    alive = [np.ones(M.shape[0], dtype=bool) for M in matrices]
+    # certificates[player][s] = ('dominated', support) or ('undominated', support)
+    certificates = [{}, {}]
+    eliminated = []
+
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_dominance_worker, initargs=(matrices,))
+    else:
+        _init_dominance_worker(matrices)
+
+    try:
+        rounds = 0
+        while True:
+            rounds += 1
+            found = [[], []]
+            for player_index in (0, 1):
+                own_alive, other_alive = alive[player_index], alive[1 - player_index]
+                columns = np.flatnonzero(other_alive)
+                tasks = []
+                for s in np.flatnonzero(own_alive).tolist():
+                    certificate = certificates[player_index].get(s)
+                    if certificate is not None:
+                        kind, support = certificate
+                        support_alive = own_alive if kind == 'dominated' else other_alive
+                        if support_alive[support].all():
+                            if kind == 'dominated':
+                                found[player_index].append((s, certificate))
+                            continue
+                    others = np.flatnonzero(own_alive)
+                    others = others[others != s]
+                    if others.size:
+                        tasks.append((s, others, columns))
+
+                batches = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+                count('mixed_dominance.lp_solves', len(tasks))
+                if pool is not None:
+                    results = pool.map(_solve_dominance_batch, [player_index] * len(batches), batches)
+                else:
+                    results = map(_solve_dominance_batch, [player_index] * len(batches), batches)
+
+                others_by_s = {s: others for s, others, _ in tasks}
+                for batch in results:
+                    for s, (eps, p, q) in batch:
+                        if eps > tol:
+                            support = others_by_s[s][p > tol]
+                            certificate = ('dominated', support)
+                            found[player_index].append((s, certificate))
+                        else:
+                            certificate = ('undominated', columns[q > tol])
+                        certificates[player_index][s] = certificate
+
+            if not found[0] and not found[1]:
+                return alive, eliminated
+            for player_index in (0, 1):
+                for s, (_, support) in found[player_index]:
+                    alive[player_index][s] = False
+                    certificates[player_index].pop(s, None)
+                    eliminated.append((rounds, player_index, s, support))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def rationalizable_strategies(df, mixed=False, workers=1):
+    # mixed=True eliminates strategies strictly dominated by mixed strategies
+    # (via LPs) instead of pure strict-then-weak dominance
+    with phase('rationalizable_strategies.to_tensor'):
+        payoffs, _ = df_to_tensor(df)
+    with phase('rationalizable_strategies.eliminate'):
+        if mixed:
+            (alive_rows, alive_cols), _ = iterated_mixed_dominance(payoffs, workers=workers)
+        else:
+            alive_rows, alive_cols = IteratedDominance(payoffs).run()
+    return df.iloc[np.flatnonzero(alive_rows), np.flatnonzero(alive_cols)]
 
 
 
 # print_payoff_matrix(df)
 
 # print("Checking Strict Dominance...")
-# strict_dom_p1 = check_dominance(1, df, 'strict')
-# strict_dom_p2 = check_dominance(2, df, 'strict')
+# strict_dom_p1 = check_dominance(1, df, 'strict', verbose=True)
+# strict_dom_p2 = check_dominance(2, df, 'strict', verbose=True)
 
 # print("\nChecking Weak Dominance...")
-# weak_dom_p1 = check_dominance(1, df, 'weak', ignore_strategies=strict_dom_p1)
-# weak_dom_p2 = check_dominance(2, df, 'weak', ignore_strategies=strict_dom_p2)
+# weak_dom_p1 = check_dominance(1, df, 'weak', ignore_strategies=strict_dom_p1, verbose=True)
+# weak_dom_p2 = check_dominance(2, df, 'weak', ignore_strategies=strict_dom_p2, verbose=True)
 
 # print("\nBest Responses:")
 # br1 = best_responses(1, df)
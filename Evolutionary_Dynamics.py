@@ -0,0 +1,144 @@
+import numpy as np
+
+from Mixed_Strategies_and_Expected_Payoffs import action_payoffs
+
+# Evolutionary dynamics on a (n1, ..., nN, N) payoff tensor.
+# Every simulator advances K independent populations at once: the state of
+# player i is a (K, n_i) array whose rows are mixed strategies (population
+# shares), and the fitness of each pure strategy comes from action_payoffs,
+# the batched form of calculate_N_payoffs. Populations that have converged
+# (largest share change below tol, per step for the replicator dynamics and
+# over a window of steps for fictitious play) are frozen and dropped from
+# later steps; the run stops early once all of them have converged.
+#
+# symmetric=True treats a symmetric two player game (like Hawk-Dove) as one
+# population playing against itself.
+
+
+def _random_simplex(rng, k, n):
+    return rng.dirichlet(np.ones(n), size=k)
+
+
+def _initial_states(payoffs, initial, n_populations, symmetric, seed):
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    if symmetric:
+        if n_players != 2 or payoffs.shape[0] != payoffs.shape[1]:
+            raise ValueError("symmetric dynamics need a square two player game")
+        if not np.allclose(payoffs[..., 0], payoffs[..., 1].T):
+            raise ValueError("game is not symmetric: payoffs[..., 0] != payoffs[..., 1].T")
+
+    rng = np.random.default_rng(seed)
+    counts = [payoffs.shape[0]] if symmetric else list(payoffs.shape[:-1])
+    if initial is None:
+        return [_random_simplex(rng, n_populations, n) for n in counts]
+    states = [np.array(np.atleast_2d(x), dtype=float) for x in initial]
+    if len(states) != len(counts):
+        raise ValueError("initial needs one (K, n_i) array per population")
+    return states
+
+
+def _fitness(payoffs, states, symmetric):
+    if symmetric:
+        return [action_payoffs(payoffs, [states[0], states[0]], 0)]
+    return [action_payoffs(payoffs, states, i) for i in range(len(states))]
+
+
+def replicator_dynamics(payoffs, initial=None, n_populations=1000, steps=10000, dt=0.01,
+                        tol=1e-8, symmetric=False, seed=None):
+    # Euler integration of x_i' = x_i (f_i - x . f) for every population.
+    # Returns (states, steps_taken, converged) where steps_taken[k] is the step
+    # at which population k converged (or the last step).
+    payoffs = np.asarray(payoffs, dtype=float)
+    states = _initial_states(payoffs, initial, n_populations, symmetric, seed)
+    k = states[0].shape[0]
+    steps_taken = np.full(k, steps, dtype=np.int64)
+    converged = np.zeros(k, dtype=bool)
+    active = np.arange(k)
+
+    for step in range(1, steps + 1):
+        current = [x[active] for x in states]
+        fitness = _fitness(payoffs, current, symmetric)
+        change = np.zeros(len(active))
+        for i, (x, f) in enumerate(zip(current, fitness)):
+            average = np.sum(x * f, axis=1, keepdims=True)
+            new = np.clip(x + dt * x * (f - average), 0.0, None)
+            new /= new.sum(axis=1, keepdims=True)
+            change = np.maximum(change, np.abs(new - x).max(axis=1))
+            states[i][active] = new
+
+        done = change < tol
+        if done.any():
+            converged[active[done]] = True
+            steps_taken[active[done]] = step
+            active = active[~done]
+            if active.size == 0:
+                break
+    return states, steps_taken, converged
+
+
+def fictitious_play(payoffs, initial=None, n_populations=1000, steps=10000, tol=1e-3,
+                    window=100, symmetric=False, seed=None):
+    # Every player best responds to the empirical frequency of the others'
+    # past play (first best response on ties). Returns the empirical
+    # frequencies as (states, steps_taken, converged).
+    # The frequencies move by about 1/t every step even when heading to a
+    # mixed equilibrium, so a population counts as converged once its
+    # frequencies moved less than tol over the last `window` steps.
+    payoffs = np.asarray(payoffs, dtype=float)
+    beliefs = _initial_states(payoffs, initial, n_populations, symmetric, seed)
+    k = beliefs[0].shape[0]
+    # Initial beliefs count as one observed round
+    counts = [b.copy() for b in beliefs]
+    snapshot = [b.copy() for b in beliefs]
+    steps_taken = np.full(k, steps, dtype=np.int64)
+    converged = np.zeros(k, dtype=bool)
+    active = np.arange(k)
+
+    for step in range(1, steps + 1):
+        current = [b[active] for b in beliefs]
+        fitness = _fitness(payoffs, current, symmetric)
+        for i, f in enumerate(fitness):
+            counts[i][active, f.argmax(axis=1)] += 1.0
+            beliefs[i][active] = counts[i][active] / (step + 1)
+        if step % window:
+            continue
+
+        change = np.zeros(len(active))
+        for b, old in zip(beliefs, snapshot):
+            change = np.maximum(change, np.abs(b[active] - old[active]).max(axis=1))
+            old[active] = b[active]
+        done = change < tol
+        if done.any():
+            converged[active[done]] = True
+            steps_taken[active[done]] = step
+            active = active[~done]
+            if active.size == 0:
+                break
+    return beliefs, steps_taken, converged
+
+
+def basins_of_attraction(payoffs, n_populations=10000, decimals=2, dynamics=replicator_dynamics, **kwargs):
+    # Share of random initial populations ending at each rest point, with
+    # final states rounded to `decimals` to group them
+    states, _, converged = dynamics(payoffs, n_populations=n_populations, **kwargs)
+    final = np.hstack([np.round(x, decimals) for x in states])
+    points, counts = np.unique(final, axis=0, return_counts=True)
+    return {tuple(p.tolist()): float(c / len(final)) for p, c in zip(points, counts)}, float(converged.mean())
+
+
+def test_fictitious_play_hawk_dove():
+    # Fictitious play approaches the mixed equilibrium (V / C = 0.8 hawks) of
+    # Hawk-Dove, so every population must be marked converged there
+    from Game_Registry import get_game
+
+    payoffs = get_game('hawk_dove').payoffs
+    states, steps_taken, converged = fictitious_play(payoffs, n_populations=200, symmetric=True, seed=0)
+    assert converged.all(), f"{(~converged).sum()} populations did not converge"
+    assert np.allclose(states[0][:, 0], 0.8, atol=0.01)
+    shares, converged_share = basins_of_attraction(payoffs, n_populations=200, decimals=1,
+                                                   dynamics=fictitious_play, symmetric=True, seed=0)
+    print(shares, converged_share, steps_taken.max())
+
+# if __name__ == "__main__":
+#     test_fictitious_play_hawk_dove()
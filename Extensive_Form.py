@@ -1,12 +1,13 @@
-import networkx as nx
-import numpy as np
-import matplotlib.pyplot as plt
-
+# networkx and matplotlib are imported on first use so that payoff lookups
+# do not pay for loading the plotting stack
 
 
 class Games:
 
     def plot_tree(self, tree, pos, node_labels, highlight_path=None):
+        import networkx as nx
+        import matplotlib.pyplot as plt
+
         # Draw all edges in default color
         nx.draw(tree, pos, with_labels=False, node_color='lightgreen', node_size=2000, arrows=True)
         nx.draw_networkx_labels(tree, pos, labels=node_labels)
@@ -44,6 +45,8 @@ class Games:
 
 
     def build_prisoners_dilemma(self, p1_decision, p2_decision, show_plot=False):
+        import networkx as nx
+
         game_tree = nx.DiGraph()
 
         # create nodes
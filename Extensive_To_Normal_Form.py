@@ -0,0 +1,138 @@
+import heapq
+import itertools
+
+import numpy as np
+
+from Game_Tree import GameTree
+
+# Conversion of a GameTree to its normal form payoff tensor.
+# A pure strategy of a player picks one action (by child position) at each of
+# the player's information sets. Strategies are produced lazily by generators;
+# only the payoff tensor itself is materialized.
+# The outcome of a profile depends only on each player's action subsequence,
+# i.e. the choices at the information sets that player can actually reach
+# given their own earlier choices. Leaf lookups are memoized on the tuple of
+# these subsequences, so strategies differing only at unreachable information
+# sets share one tree walk. With reduced=True such strategies are collapsed
+# into one (the reduced normal form), printed with '*' at the unused sets.
+
+
+def information_sets(tree: GameTree, player: int) -> list:
+    # Information sets of `player` as (set id, first node, number of actions)
+    owned = np.flatnonzero(tree.player == player)
+    sets = {}
+    for node in owned.tolist():
+        h = int(tree.info_set[node])
+        if h not in sets:
+            sets[h] = (h, node, int(tree.child_count[node]))
+        elif sets[h][2] != tree.child_count[node]:
+            raise ValueError(f"nodes of information set {h} offer different numbers of actions")
+    return [sets[h] for h in sorted(sets)]
+
+
+def count_pure_strategies(tree: GameTree, player: int) -> int:
+    return int(np.prod([n for _, _, n in information_sets(tree, player)], dtype=object))
+
+
+def pure_strategies(tree: GameTree, player: int):
+    # Generator over full pure strategies as dicts {information set: child position}
+    sets = information_sets(tree, player)
+    ids = [h for h, _, _ in sets]
+    for choice in itertools.product(*[range(n) for _, _, n in sets]):
+        yield dict(zip(ids, choice))
+
+
+def reduced_strategies(tree: GameTree, player: int):
+    # Generator over reduced strategies: choices only at the information sets
+    # reachable under the player's own earlier choices. Nodes are expanded in
+    # breadth first order so the output order matches pure_strategies.
+    def expand(frontier, plan):
+        frontier = list(frontier)
+        while frontier:
+            node = heapq.heappop(frontier)
+            if tree.child_count[node] == 0:
+                continue
+            first = int(tree.child_offset[node])
+            if tree.player[node] != player:
+                for child in range(first, int(tree.child_offset[node + 1])):
+                    heapq.heappush(frontier, child)
+                continue
+            h = int(tree.info_set[node])
+            if h in plan:
+                heapq.heappush(frontier, first + plan[h])
+                continue
+            for position in range(int(tree.child_count[node])):
+                branch = list(frontier)
+                heapq.heappush(branch, first + position)
+                yield from expand(branch, {**plan, h: position})
+            return
+        yield plan
+
+    yield from expand([0], {})
+
+
+def action_subsequence(tree: GameTree, player: int, strategy: dict) -> tuple:
+    # The (information set, position) choices of `strategy` at the sets the
+    # player can reach given their own choices; equal subsequences give the
+    # same outcome against every opponent profile
+    seen = []
+    frontier = [0]
+    visited = set()
+    while frontier:
+        node = heapq.heappop(frontier)
+        if tree.child_count[node] == 0:
+            continue
+        first = int(tree.child_offset[node])
+        if tree.player[node] == player:
+            h = int(tree.info_set[node])
+            if h not in visited:
+                visited.add(h)
+                seen.append((h, strategy[h]))
+            heapq.heappush(frontier, first + strategy[h])
+        else:
+            for child in range(first, int(tree.child_offset[node + 1])):
+                heapq.heappush(frontier, child)
+    return tuple(seen)
+
+
+def strategy_label(tree: GameTree, player: int, strategy: dict) -> str:
+    parts = []
+    for h, node, _ in information_sets(tree, player):
+        if h in strategy:
+            child = int(tree.child_offset[node]) + strategy[h]
+            parts.append(str(tree.action_labels[tree.action[child]]))
+        else:
+            parts.append('*')
+    return '/'.join(parts)
+
+
+def play(tree: GameTree, profile: list) -> int:
+    # Leaf reached when every player follows their strategy in `profile`
+    node = 0
+    while tree.child_count[node] > 0:
+        mover = tree.player[node]
+        node = int(tree.child_offset[node]) + profile[mover][int(tree.info_set[node])]
+    return node
+
+
+def to_normal_form(tree: GameTree, reduced: bool = False):
+    # Payoff tensor of shape (|S_1|, ..., |S_N|, N) and strategy labels
+    generator = reduced_strategies if reduced else pure_strategies
+    strategies, keys, labels = [], [], []
+    for player in range(tree.n_players):
+        player_strategies = list(generator(tree, player))
+        strategies.append(player_strategies)
+        keys.append([action_subsequence(tree, player, s) for s in player_strategies])
+        labels.append([strategy_label(tree, player, s) for s in player_strategies])
+
+    shape = tuple(len(s) for s in strategies)
+    payoffs = np.empty(shape + (tree.n_players,), dtype=float)
+    leaf_cache = {}
+    for index in np.ndindex(shape):
+        key = tuple(keys[i][a] for i, a in enumerate(index))
+        leaf = leaf_cache.get(key)
+        if leaf is None:
+            leaf = play(tree, [strategies[i][a] for i, a in enumerate(index)])
+            leaf_cache[key] = leaf
+        payoffs[index] = tree.payoffs[tree.leaf_index[leaf]]
+    return payoffs, labels
@@ -0,0 +1,151 @@
+import hashlib
+import shelve
+from collections import OrderedDict
+
+import numpy as np
+
+from Payoff_Tensor import df_to_tensor
+
+# Result cache for normal form games keyed by a canonical form of the payoff
+# tensor, so a game is solved once no matter how its strategies are ordered
+# or labelled. Results are stored in canonical strategy indices and mapped
+# back to the caller's labels on every hit.
+#
+# The canonical order sorts each player's strategies by the sorted multiset of
+# payoffs in their slice (invariant to every other player's order), breaking
+# ties by the slice contents in the current order. Ties can leave two
+# orderings of the same game with different keys; that only costs a miss, as a
+# key is always the hash of the actual permuted tensor.
+
+
+def canonical_form(payoffs, sweeps=2):
+    # Returns (canonical tensor, perms) with canonical = payoffs permuted so that
+    # canonical position k of player i is original strategy perms[i][k]
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    perms = [np.arange(n) for n in payoffs.shape[:-1]]
+    canonical = payoffs
+
+    signatures = []
+    for i in range(n_players):
+        slices = np.moveaxis(payoffs, i, 0).reshape(payoffs.shape[i], -1)
+        signatures.append(np.sort(slices, axis=1))
+
+    for _ in range(sweeps):
+        for i in range(n_players):
+            slices = np.moveaxis(canonical, i, 0).reshape(canonical.shape[i], -1)
+            keys = np.hstack([signatures[i][perms[i]], slices])
+            order = np.lexsort(keys.T[::-1])
+            perms[i] = perms[i][order]
+            canonical = np.take(canonical, order, axis=i)
+    return canonical, perms
+
+
+def game_key(canonical):
+    digest = hashlib.sha256()
+    digest.update(repr(canonical.shape).encode())
+    digest.update(np.ascontiguousarray(canonical, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class GameCache:
+    # LRU cache in memory with an optional shelve file as a second tier.
+
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._disk = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _lookup(self, key, kind):
+        entry = self._memory.get(key)
+        if entry is not None and kind in entry:
+            self._memory.move_to_end(key)
+            return entry[kind]
+        if self._disk is not None:
+            stored = self._disk.get(f"{key}:{kind}")
+            if stored is not None:
+                self._store_memory(key, kind, stored)
+                return stored
+        return None
+
+    def _store_memory(self, key, kind, value):
+        entry = self._memory.setdefault(key, {})
+        entry[kind] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _store(self, key, kind, value):
+        self._store_memory(key, kind, value)
+        if self._disk is not None:
+            self._disk[f"{key}:{kind}"] = value
+
+    def _cached(self, payoffs, kind, solve):
+        # Canonical tensor, perms and the solved result for `kind`
+        canonical, perms = canonical_form(payoffs)
+        key = game_key(canonical)
+        result = self._lookup(key, kind)
+        if result is None:
+            self.misses += 1
+            result = solve(canonical)
+            self._store(key, kind, result)
+        else:
+            self.hits += 1
+        return result, perms
+
+    def find_nash_equilibria(self, df):
+        from Nash_Equilibrium_Computation_and_Output import find_nash_equilibria_tensor
+
+        payoffs, labels = df_to_tensor(df)
+        equilibria, perms = self._cached(payoffs, 'nash', find_nash_equilibria_tensor)
+        return {
+            tuple(labels[i][perms[i][a]] for i, a in enumerate(profile))
+            for profile in equilibria.tolist()
+        }
+
+    def rationalizable_strategies(self, df):
+        from Dominance_and_Rationalizability import IteratedDominance
+
+        def solve(canonical):
+            return tuple(IteratedDominance(canonical).run())
+
+        payoffs, _ = df_to_tensor(df)
+        (alive_rows, alive_cols), perms = self._cached(payoffs, 'rationalizable', solve)
+        rows = np.sort(perms[0][alive_rows])
+        cols = np.sort(perms[1][alive_cols])
+        return df.iloc[rows, cols]
+
+    def best_responses(self, player, df):
+        # Same result as Dominance_and_Rationalizability.best_responses
+        from Nash_Equilibrium_Computation_and_Output import best_response_mask
+
+        def solve(canonical):
+            return best_response_mask(canonical, player - 1)
+
+        payoffs, labels = df_to_tensor(df)
+        mask, perms = self._cached(payoffs, f'best_responses_{player}', solve)
+        # Undo the canonical permutation: original index perms[i][k] sits at k
+        inverse = [np.argsort(p) for p in perms]
+        mask = mask[np.ix_(inverse[0], inverse[1])]
+
+        best_resp = {}
+        if player == 1:
+            for c, col in enumerate(labels[1]):
+                best_resp[col] = [labels[0][r] for r in np.flatnonzero(mask[:, c])]
+        else:
+            for r, row in enumerate(labels[0]):
+                best_resp[row] = [labels[1][c] for c in np.flatnonzero(mask[r])]
+        return best_resp
@@ -0,0 +1,95 @@
+import json
+import struct
+
+import numpy as np
+
+from Payoff_Tensor import default_labels, df_to_tensor, tensor_to_df
+
+# Compact binary file format for normal form games:
+#
+#   magic      8 bytes   b'GTGAME01'
+#   size       4 bytes   little endian uint32, length of the JSON header
+#   header     JSON      {"dtype": "<f8", "shape": [n1, ..., nN, N], "labels": [[...], ...]}
+#   padding    zeros up to the next multiple of 64 bytes
+#   payoffs    the payoff tensor in C order with the header's fixed dtype
+#
+# Loading maps the payoff block with np.memmap, so the dominance and Nash
+# routines can work on games far larger than RAM; only the pages they touch
+# are read.
+
+MAGIC = b'GTGAME01'
+ALIGN = 64
+
+
+def _header_bytes(shape, dtype, labels):
+    header = {'dtype': np.dtype(dtype).str, 'shape': [int(n) for n in shape], 'labels': labels}
+    body = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    offset = len(MAGIC) + 4 + len(body)
+    padding = (-offset) % ALIGN
+    return MAGIC + struct.pack('<I', len(body)) + body + b'\0' * padding
+
+
+def _json_labels(labels):
+    return [[s if isinstance(s, (str, int, float, bool)) else str(s) for s in player] for player in labels]
+
+
+def create_game(path, shape, labels=None, dtype=np.float64):
+    # Write the header and return a writable memmap of the payoff tensor, for
+    # filling generated games block by block without holding them in memory
+    shape = tuple(int(n) for n in shape)
+    if labels is None:
+        labels = default_labels(shape[:-1])
+    header = _header_bytes(shape, dtype, _json_labels(labels))
+    with open(path, 'wb') as f:
+        f.write(header)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if size:
+            f.seek(len(header) + size - 1)
+            f.write(b'\0')
+    return np.memmap(path, dtype=dtype, mode='r+', offset=len(header), shape=shape)
+
+
+def save_game(path, payoffs, labels=None, dtype=None):
+    payoffs = np.asarray(payoffs)
+    dtype = np.dtype(dtype or payoffs.dtype)
+    if labels is None:
+        labels = default_labels(payoffs.shape[:-1])
+    with open(path, 'wb') as f:
+        f.write(_header_bytes(payoffs.shape, dtype, _json_labels(labels)))
+        f.write(np.ascontiguousarray(payoffs, dtype=dtype).tobytes())
+    return path
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a game file")
+        (size,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(size).decode('utf-8'))
+    offset = len(MAGIC) + 4 + size
+    header['offset'] = offset + (-offset) % ALIGN
+    return header
+
+
+def load_game(path, mmap=True, mode='r'):
+    # Returns (payoffs, labels); payoffs is a read only np.memmap unless mmap=False
+    header = read_header(path)
+    shape = tuple(header['shape'])
+    dtype = np.dtype(header['dtype'])
+    if mmap:
+        payoffs = np.memmap(path, dtype=dtype, mode=mode, offset=header['offset'], shape=shape)
+    else:
+        with open(path, 'rb') as f:
+            f.seek(header['offset'])
+            payoffs = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    return payoffs, header['labels']
+
+
+def save_game_df(path, df, dtype=np.float64):
+    payoffs, labels = df_to_tensor(df)
+    return save_game(path, payoffs, labels, dtype)
+
+
+def load_game_df(path):
+    payoffs, labels = load_game(path, mmap=False)
+    return tensor_to_df(payoffs, labels)
@@ -0,0 +1,214 @@
+import numpy as np
+
+# Seeded random normal form games for load and correctness testing.
+# Every generator takes the action counts of the N players and returns a
+# payoff tensor of shape (n1, ..., nN, N) (see Payoff_Tensor.py), or a batch
+# of shape (n_games, n1, ..., nN, N) when n_games is given, drawn in one
+# vectorized call. The structured families plant a known answer:
+#
+#   zero_sum_games            payoffs sum to 0 in every profile
+#   potential_games           exact potential games (u_i = phi + term free of i's action)
+#   coordination_games        every diagonal profile (a, a, ..., a) is a strict equilibrium
+#   dominance_chain_games     iterated strict dominance removes the strategies one
+#                             by one, down to the profile (0, ..., 0)
+#   planted_equilibria_games  n_equilibria given profiles are strict pure equilibria
+#
+# save_generated() writes single games to the Game_File format and batches
+# to a .npy file, chunk by chunk.
+
+
+def _rng(seed):
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _size(shape, n_games):
+    shape = tuple(int(n) for n in shape)
+    return (1 if n_games is None else int(n_games),) + shape + (len(shape),)
+
+
+def _finish(payoffs, n_games):
+    return payoffs[0] if n_games is None else payoffs
+
+
+def uniform_games(shape, n_games=None, low=0.0, high=100.0, integer=False, seed=None):
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    if integer:
+        payoffs = rng.integers(int(low), int(high), size=size).astype(float)
+    else:
+        payoffs = rng.uniform(low, high, size=size)
+    return _finish(payoffs, n_games)
+
+
+def covariant_games(shape, n_games=None, rho=0.0, scale=100.0, seed=None):
+    # Payoffs of the N players in each profile are normal with correlation rho
+    # (1: common interest, -1 with two players: zero sum); rho must be at
+    # least -1 / (N - 1)
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    n_players = size[-1]
+    if n_players > 1 and not -1.0 / (n_players - 1) - 1e-12 <= rho <= 1.0:
+        raise ValueError(f"rho must lie in [{-1.0 / (n_players - 1):.3g}, 1] for {n_players} players")
+    corr = np.full((n_players, n_players), float(rho))
+    np.fill_diagonal(corr, 1.0)
+    # Eigen decomposition instead of Cholesky so the singular ends work too
+    values, vectors = np.linalg.eigh(corr)
+    factor = vectors * np.sqrt(np.clip(values, 0.0, None))
+    payoffs = rng.standard_normal(size) @ factor.T
+    return _finish(scale * payoffs, n_games)
+
+
+def zero_sum_games(shape, n_games=None, low=-100.0, high=100.0, seed=None):
+    # The last player's payoff is minus the sum of the others'
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    payoffs = np.empty(size)
+    payoffs[..., :-1] = rng.uniform(low, high, size=size[:-1] + (size[-1] - 1,))
+    payoffs[..., -1] = -payoffs[..., :-1].sum(axis=-1)
+    return _finish(payoffs, n_games)
+
+
+def potential_games(shape, n_games=None, low=0.0, high=100.0, return_potential=False, seed=None):
+    # u_i = phi + d_i with d_i constant along player i's own axis, so every
+    # unilateral deviation changes u_i and phi by the same amount
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    phi = rng.uniform(low, high, size=size[:-1])
+    payoffs = np.empty(size)
+    for i in range(size[-1]):
+        dummy_shape = list(size[:-1])
+        dummy_shape[i + 1] = 1
+        payoffs[..., i] = phi + rng.uniform(low, high, size=dummy_shape)
+    payoffs = _finish(payoffs, n_games)
+    if return_potential:
+        return payoffs, _finish(phi, n_games)
+    return payoffs
+
+
+def coordination_games(shape, n_games=None, low=0.0, high=100.0, seed=None):
+    # Off-diagonal payoffs in [low, mid), diagonal ones in [mid, high): any
+    # deviation from a diagonal profile leaves the diagonal and pays less
+    shape = tuple(int(n) for n in shape)
+    if len(set(shape)) != 1:
+        raise ValueError("coordination games need the same number of actions for every player")
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    mid = (low + high) / 2
+    payoffs = rng.uniform(low, mid, size=size)
+    diagonal = (slice(None),) + (np.arange(shape[0]),) * len(shape)
+    payoffs[diagonal] = rng.uniform(mid, high, size=(size[0], shape[0], len(shape)))
+    return _finish(payoffs, n_games)
+
+
+def _removal_order(shape):
+    # Players in turn drop their highest alive strategy until one is left
+    # each; yields (player, strategy, alive counts after the removal)
+    alive = list(shape)
+    while any(n > 1 for n in alive):
+        for i in range(len(alive)):
+            if alive[i] > 1:
+                alive[i] -= 1
+                yield i, alive[i], tuple(alive)
+
+
+def dominance_chain_games(shape, n_games=None, low=0.0, high=100.0, seed=None):
+    # Strategy s >= 1 of player i is strictly worse than s - 1 against the
+    # opponent profiles still alive when it is due for removal, and beats every
+    # lower strategy against the opponent strategies removed before that, so
+    # it only becomes dominated after the previous removal. Iterated strict
+    # dominance therefore needs one round per removal (removals facing the
+    # same opponent strategies fall in one round) and leaves (0, ..., 0).
+    # Payoffs start in [low, high) and drift by the planted gaps.
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    k, shape, n_players = size[0], size[1:-1], size[-1]
+    payoffs = np.empty(size)
+    steps = {(i, s): alive for i, s, alive in _removal_order(shape)}
+    gap = (high - low) / (2 * max(shape))
+
+    for i in range(n_players):
+        others = [j for j in range(n_players) if j != i]
+        other_shape = [shape[j] for j in others]
+        rows = np.empty((k, shape[i], int(np.prod(other_shape, dtype=np.int64))))
+        rows[:, 0] = rng.uniform(low, high, size=(k, rows.shape[2]))
+        for s in range(1, shape[i]):
+            alive = steps[i, s]
+            mask = np.ones(other_shape, dtype=bool)
+            for axis, j in enumerate(others):
+                index = [None] * len(others)
+                index[axis] = slice(None)
+                mask &= (np.arange(shape[j]) < alive[j])[tuple(index)]
+            mask = mask.ravel()
+            rows[:, s, mask] = rows[:, s - 1, mask] - rng.uniform(0.1 * gap, gap, size=(k, np.count_nonzero(mask)))
+            rows[:, s, ~mask] = rows[:, :s, ~mask].max(axis=1) + rng.uniform(0.1 * gap, gap, size=(k, np.count_nonzero(~mask)))
+        own = np.moveaxis(payoffs[..., i], i + 1, 1)
+        own[...] = rows.reshape(own.shape)
+    return _finish(payoffs, n_games)
+
+
+def planted_equilibria_games(shape, n_equilibria=1, n_games=None, low=0.0, high=100.0,
+                             return_profiles=False, seed=None):
+    # Uniform payoffs with n_equilibria profiles raised to strict pure
+    # equilibria. Planted profiles differ in every coordinate, so none lies on
+    # another's deviation lines; other equilibria may still occur by chance.
+    # profiles has shape (n_games, n_equilibria, N).
+    shape = tuple(int(n) for n in shape)
+    if n_equilibria > min(shape):
+        raise ValueError("n_equilibria cannot exceed the smallest action count")
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    k, n_players = size[0], size[-1]
+    payoffs = rng.uniform(low, high, size=size)
+    profiles = np.stack([
+        rng.permuted(np.broadcast_to(np.arange(n), (k, n)), axis=1)[:, :n_equilibria]
+        for n in shape
+    ], axis=-1)
+
+    games = np.arange(k)[:, None]
+    for i in range(n_players):
+        # Max of player i's payoff along its own axis through every profile
+        own = np.moveaxis(payoffs[..., i], i + 1, -1)
+        others = tuple(profiles[..., j] for j in range(n_players) if j != i)
+        line_max = own[(games,) + others].max(axis=-1)
+        index = (games,) + tuple(profiles[..., j] for j in range(n_players)) + (i,)
+        payoffs[index] = line_max + rng.uniform(0.01, 0.1, size=line_max.shape) * (high - low)
+    payoffs = _finish(payoffs, n_games)
+    if return_profiles:
+        return payoffs, _finish(profiles, n_games)
+    return payoffs
+
+
+GENERATORS = {
+    'uniform': uniform_games,
+    'covariant': covariant_games,
+    'zero_sum': zero_sum_games,
+    'potential': potential_games,
+    'coordination': coordination_games,
+    'dominance_chain': dominance_chain_games,
+    'planted_equilibria': planted_equilibria_games,
+}
+
+
+def generate(kind, shape, n_games=None, seed=None, **kw):
+    try:
+        generator = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown game kind {kind!r}, expected one of {sorted(GENERATORS)}") from None
+    return generator(shape, n_games=n_games, seed=seed, **kw)
+
+
+def save_generated(path, kind, shape, n_games=None, seed=None, chunk=4096, dtype=np.float64, **kw):
+    # A single game goes to a Game_File; a batch to a (n_games, n1, ..., N)
+    # .npy file written `chunk` games at a time from one seeded stream
+    if n_games is None:
+        from Game_File import save_game
+        return save_game(path, generate(kind, shape, seed=seed, **kw), dtype=dtype)
+    rng = _rng(seed)
+    size = _size(shape, n_games)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=size)
+    for start in range(0, size[0], chunk):
+        stop = min(start + chunk, size[0])
+        out[start:stop] = generate(kind, shape, n_games=stop - start, seed=rng, **kw)
+    out.flush()
+    del out
+    return path
@@ -0,0 +1,187 @@
+import functools
+
+import numpy as np
+
+# Registry of normal form games defined as data: a payoff tensor of shape
+# (n1, ..., nN, N) plus the action labels of every player (see
+# Payoff_Tensor.py). Each game is built once; single payoffs are a dict and an
+# array lookup, and lookup() evaluates whole arrays of action profiles with
+# one fancy-indexing call.
+#
+# Parametrised families register a builder returning (payoffs, labels); the
+# FAMILY_CACHE_SIZE most recently used parameter sets are kept built, so
+# sweeps over many parameters do not grow memory without bound.
+#
+#   register_family('hawk_dove', hawk_dove, V=40, C=50)
+#   get_game('hawk_dove', V=60, C=20).lookup(p1_actions, p2_actions)
+
+
+class GameSpec:
+    __slots__ = ('name', 'payoffs', 'labels', 'players', '_index', '_sorted', '_order', '_tree', '_arrays')
+
+    def __init__(self, name, payoffs, labels, players=None):
+        payoffs = np.array(payoffs)
+        if payoffs.dtype.kind == 'f' and np.all(payoffs == np.round(payoffs)):
+            payoffs = payoffs.astype(np.int64)
+        if payoffs.shape[:-1] != tuple(len(player) for player in labels) or payoffs.shape[-1] != len(labels):
+            raise ValueError(f"payoffs of shape {payoffs.shape} do not match labels {labels}")
+        payoffs.setflags(write=False)
+        self.name = name
+        self.payoffs = payoffs
+        self.labels = [list(player) for player in labels]
+        self.players = list(players) if players is not None else [f"p{i + 1}" for i in range(len(labels))]
+        self._index = [{label: a for a, label in enumerate(player)} for player in self.labels]
+        # Sorted labels for vectorized label -> index conversion
+        self._order = [np.argsort(np.array(player)) for player in self.labels]
+        self._sorted = [np.array(player)[order] for player, order in zip(self.labels, self._order)]
+        self._tree = None
+        self._arrays = None
+
+    @property
+    def n_players(self):
+        return len(self.labels)
+
+    def profile(self, *actions):
+        # Strategy indices of one profile of labels, None if any is unknown
+        try:
+            return tuple(self._index[i][a] for i, a in enumerate(actions))
+        except KeyError:
+            return None
+
+    def payoff(self, *actions):
+        # Payoff tuple of one action profile, None for unknown actions (as the
+        # old if/elif chains returned)
+        index = self.profile(*actions)
+        if index is None:
+            return None
+        return tuple(self.payoffs[index].tolist())
+
+    def codes(self, player_index, actions):
+        # Strategy indices for an array of labels (or of indices) of one player
+        actions = np.asarray(actions)
+        n = len(self.labels[player_index])
+        if actions.dtype.kind in 'iu':
+            valid = (actions >= 0) & (actions < n)
+            codes = actions
+        else:
+            sorted_labels = self._sorted[player_index]
+            pos = np.minimum(np.searchsorted(sorted_labels, actions), n - 1)
+            valid = sorted_labels[pos] == actions
+            codes = self._order[player_index][pos]
+        if not np.all(valid):
+            bad = np.unique(actions[~valid])[:5].tolist()
+            raise ValueError(f"Unknown actions for player {player_index + 1} in {self.name}: {bad}")
+        return codes
+
+    def lookup(self, *actions):
+        # Payoffs of many profiles at once: one array of labels or indices per
+        # player, all broadcast together; returns shape (..., N)
+        return self.payoffs[tuple(self.codes(i, a) for i, a in enumerate(actions))]
+
+    def to_df(self):
+        from Payoff_Tensor import tensor_to_df
+        return tensor_to_df(self.payoffs, self.labels)
+
+    def tree(self):
+        # (networkx tree, positions) of the sequential form of a two player
+        # game, built on first use: Start -> '<p1>_<a>' -> '<a><b>'
+        if self._tree is None:
+            import networkx as nx
+
+            if self.n_players != 2:
+                raise ValueError("Game trees are only drawn for two player games")
+            first, second = self.labels
+            tree = nx.DiGraph()
+            tree.add_node('Start', player=self.players[0], label='Start')
+            pos = {'Start': (0, 2)}
+            # Leaves evenly spaced over [-2, 2] with one empty slot between
+            # subtrees, each decision node above the middle of its leaves
+            slots = np.linspace(-2, 2, len(first) * (len(second) + 1) - 1)
+            for a, x in enumerate(first):
+                node = f"{self.players[0]}_{x}"
+                tree.add_node(node, player=self.players[1])
+                tree.add_edge('Start', node, action=x)
+                xs = slots[a * (len(second) + 1):a * (len(second) + 1) + len(second)]
+                pos[node] = (float(xs.mean()), 1)
+                for b, y in enumerate(second):
+                    leaf = f"{x}{y}"
+                    tree.add_node(leaf, payoff=tuple(self.payoffs[a, b].tolist()))
+                    tree.add_edge(node, leaf, action=y)
+                    pos[leaf] = (float(xs[b]), 0)
+            self._tree = (tree, pos)
+        return self._tree
+
+    def game_tree(self):
+        # Array form (Game_Tree.GameTree) of the same tree, for simulate()
+        if self._arrays is None:
+            from Game_Tree import GameTree
+            self._arrays = GameTree.from_payoff_tensor(self.payoffs, self.labels, self.players)
+        return self._arrays
+
+    def path(self, *actions):
+        # Edges from Start to the leaf of a two player profile, stopping at
+        # the first unknown action
+        first, second = actions
+        path = []
+        if first in self._index[0]:
+            node = f"{self.players[0]}_{first}"
+            path.append(('Start', node))
+            if second in self._index[1]:
+                path.append((node, f"{first}{second}"))
+        return path
+
+
+FAMILY_CACHE_SIZE = 256
+
+_games = {}
+_families = {}
+
+
+def register_game(name, payoffs, labels, players=None):
+    spec = GameSpec(name, payoffs, labels, players)
+    _games[name] = spec
+    return spec
+
+
+def register_family(name, builder, players=None, **defaults):
+    # builder(**params) -> (payoffs, labels); get_game(name) uses `defaults`
+    _families[name] = (builder, players, defaults)
+    _games.pop(name, None)
+    _family_game.cache_clear()
+
+
+@functools.lru_cache(maxsize=FAMILY_CACHE_SIZE)
+def _family_game(name, params):
+    builder, players, _ = _families[name]
+    return GameSpec(name, *builder(**dict(params)), players=players)
+
+
+def get_game(name, **params):
+    if name in _families:
+        defaults = _families[name][2]
+        return _family_game(name, tuple(sorted({**defaults, **params}.items())))
+    if params:
+        raise ValueError(f"{name} is not a parametrised game family")
+    try:
+        return _games[name]
+    except KeyError:
+        raise KeyError(f"Unknown game {name!r}") from None
+
+
+def registered_games():
+    return sorted(set(_games) | set(_families))
+
+
+def hawk_dove(V, C):
+    # Value of the resource V, cost of a fight C
+    payoffs = [
+        [((V - C) / 2, (V - C) / 2), (V, 0)],
+        [(0, V), (V / 2, V / 2)],
+    ]
+    return payoffs, [['h', 'd'], ['h', 'd']]
+
+
+register_game('prisoners_dilemma', [[(5, 5), (0, 20)], [(20, 0), (1, 1)]], [['c', 'd'], ['c', 'd']])
+register_game('battle_of_sexes', [[(3, 2), (0, 0)], [(0, 0), (2, 3)]], [['f', 'b'], ['f', 'b']], players=['m', 'w'])
+register_game('matching_pennies', [[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]], [['h', 't'], ['h', 't']])
+register_family('hawk_dove', hawk_dove, V=40, C=50)
@@ -0,0 +1,311 @@
+import numpy as np
+
+# Array backed extensive form games.
+# Nodes are numbered in breadth first order with the root at 0, so:
+#   - the children of node v are the contiguous ids child_offset[v] .. child_offset[v + 1] - 1
+#   - the nodes at depth d are the contiguous ids level_offset[d] .. level_offset[d + 1] - 1
+#   - every child has a larger id than its parent, so sweeping the levels from
+#     the deepest up visits children before parents (a post-order)
+# Per node arrays: parent (-1 at the root), player (-1 at leaves), action
+# (index into action_labels of the edge leading to the node, -1 at the root)
+# and leaf_index (row of the node in the payoffs matrix, -1 for decision nodes).
+# An optional info_set array groups decision nodes the mover cannot tell
+# apart (e.g. simultaneous moves); by default every decision node is its own
+# information set. backward_induction assumes perfect information.
+# simulate() follows many action sequences at once, one vectorized lookup per
+# depth in a sorted (parent, action) edge index.
+
+
+def _index_dtype(n):
+    return np.int32 if n < 2**31 - 1 else np.int64
+
+
+class GameTree:
+
+    def __init__(self, child_count, player, action, leaf_payoffs, action_labels=None, player_names=None, info_set=None):
+        child_count = np.asarray(child_count)
+        n = len(child_count)
+        idx = _index_dtype(n + 1)
+        if n == 0 or child_count.sum() != n - 1:
+            raise ValueError("child_count must describe a single tree in breadth first order")
+
+        self.child_count = child_count.astype(idx)
+        self.child_offset = np.empty(n + 1, dtype=idx)
+        self.child_offset[0] = 1
+        np.cumsum(self.child_count, out=self.child_offset[1:])
+        self.child_offset[1:] += 1
+
+        self.parent = np.empty(n, dtype=idx)
+        self.parent[0] = -1
+        self.parent[1:] = np.repeat(np.arange(n, dtype=idx), self.child_count)
+
+        self.player = np.asarray(player, dtype=np.int16)
+        self.action = np.asarray(action, dtype=np.int32)
+
+        is_leaf = self.child_count == 0
+        self.leaf_index = np.full(n, -1, dtype=idx)
+        self.leaf_index[is_leaf] = np.arange(np.count_nonzero(is_leaf), dtype=idx)
+        self.payoffs = np.asarray(leaf_payoffs, dtype=float)
+        if self.payoffs.shape[0] != np.count_nonzero(is_leaf):
+            raise ValueError("leaf_payoffs must have one row per leaf, in node order")
+
+        if info_set is None:
+            info_set = np.where(is_leaf, -1, np.arange(n))
+        self.info_set = np.asarray(info_set, dtype=idx)
+
+        self.level_offset = self._levels()
+        n_players = self.payoffs.shape[1]
+        self.action_labels = list(action_labels) if action_labels is not None else [str(a) for a in range(self.action.max() + 1)]
+        self.player_names = list(player_names) if player_names is not None else [f"p{i + 1}" for i in range(n_players)]
+        self._edges = None
+        self._labels = None
+
+    def _levels(self):
+        # Level d + 1 is exactly the children of level d
+        offsets = [0, 1]
+        while offsets[-1] < len(self.parent):
+            stop = offsets[-1]
+            offsets.append(int(self.child_offset[stop]))
+            if offsets[-1] == stop:
+                break
+        return np.array(offsets, dtype=np.int64)
+
+    @property
+    def n_nodes(self):
+        return len(self.parent)
+
+    @property
+    def n_players(self):
+        return self.payoffs.shape[1]
+
+    def children(self, node):
+        return np.arange(self.child_offset[node], self.child_offset[node + 1])
+
+    def nbytes(self):
+        arrays = (self.child_count, self.child_offset, self.parent, self.player, self.action, self.leaf_index, self.info_set, self.payoffs)
+        return sum(a.nbytes for a in arrays)
+
+    @classmethod
+    def from_networkx(cls, tree, root='Start', info_sets=None):
+        # Convert one of the Games networkx trees (nodes carry 'player' or
+        # 'payoff', edges carry 'action') to the array form. info_sets is an
+        # optional list of lists of node names sharing an information set.
+        order = [root]
+        for node in order:
+            order.extend(tree.successors(node))
+        index = {node: i for i, node in enumerate(order)}
+
+        player_names, action_labels = [], []
+        player = np.full(len(order), -1, dtype=np.int16)
+        action = np.full(len(order), -1, dtype=np.int32)
+        child_count = np.zeros(len(order), dtype=np.int64)
+        payoffs = []
+        for node in order:
+            i = index[node]
+            attrs = tree.nodes[node]
+            child_count[i] = tree.out_degree(node)
+            if child_count[i]:
+                if attrs['player'] not in player_names:
+                    player_names.append(attrs['player'])
+                player[i] = player_names.index(attrs['player'])
+            else:
+                payoffs.append(attrs['payoff'])
+            for child in tree.successors(node):
+                label = tree.edges[node, child]['action']
+                if label not in action_labels:
+                    action_labels.append(label)
+                action[index[child]] = action_labels.index(label)
+
+        info_set = np.where(child_count > 0, np.arange(len(order)), -1)
+        for group in info_sets or []:
+            ids = [index[node] for node in group]
+            info_set[ids] = min(ids)
+
+        tree_arrays = cls(child_count, player, action, payoffs, action_labels, player_names, info_set)
+        tree_arrays.node_names = order
+        return tree_arrays
+
+    @classmethod
+    def from_payoff_tensor(cls, payoffs, labels, player_names=None):
+        # Sequential form of a normal form game: player i moves at depth i and
+        # all nodes of a depth share one information set, so each player moves
+        # without seeing the earlier moves. Leaves follow the C order of the
+        # (n1, ..., nN, N) tensor. Node names match the Games trees for two
+        # players: 'Start', '<p1>_<a>', then concatenated labels at the leaves.
+        payoffs = np.asarray(payoffs)
+        shape = payoffs.shape[:-1]
+        n_players = len(shape)
+        if player_names is None:
+            player_names = [f"p{i + 1}" for i in range(n_players)]
+        action_labels = list(dict.fromkeys(label for player in labels for label in player))
+        label_id = {label: k for k, label in enumerate(action_labels)}
+
+        level_sizes = np.cumprod((1,) + shape)
+        n = int(level_sizes.sum())
+        child_count = np.zeros(n, dtype=np.int64)
+        player = np.full(n, -1, dtype=np.int16)
+        action = np.full(n, -1, dtype=np.int32)
+        info_set = np.full(n, -1, dtype=np.int64)
+        names = ['Start']
+        paths = ['']
+        start = 0
+        for d, size in enumerate(level_sizes[:-1]):
+            size = int(size)
+            child_count[start:start + size] = shape[d]
+            player[start:start + size] = d
+            info_set[start:start + size] = start
+            ids = np.array([label_id[label] for label in labels[d]], dtype=np.int32)
+            action[start + size:start + size + size * shape[d]] = np.tile(ids, size)
+            paths = [path + str(label) for path in paths for label in labels[d]]
+            if d + 1 < n_players:
+                names.extend(f"{player_names[d]}_{path}" for path in paths)
+            else:
+                names.extend(paths)
+            start += size
+
+        tree = cls(child_count, player, action, payoffs.reshape(-1, n_players), action_labels, player_names, info_set)
+        tree.node_names = names
+        return tree
+
+    @classmethod
+    def uniform(cls, depth, branching, n_players=2, seed=None):
+        # Complete tree of the given depth with players moving in turn and
+        # random integer payoffs; useful for building very large trees
+        rng = np.random.default_rng(seed)
+        level_sizes = [branching ** d for d in range(depth + 1)]
+        n = sum(level_sizes)
+        child_count = np.zeros(n, dtype=np.int64)
+        child_count[:n - level_sizes[-1]] = branching
+        player = np.full(n, -1, dtype=np.int16)
+        action = np.full(n, -1, dtype=np.int32)
+        start = 0
+        for d, size in enumerate(level_sizes):
+            if d < depth:
+                player[start:start + size] = d % n_players
+            if d > 0:
+                action[start:start + size] = np.tile(np.arange(branching, dtype=np.int32), size // branching)
+            start += size
+        payoffs = rng.integers(-10, 11, size=(level_sizes[-1], n_players)).astype(float)
+        return cls(child_count, player, action, payoffs)
+
+    def backward_induction(self):
+        # Subgame perfect equilibrium by one sweep over the levels from the
+        # deepest up. At every decision node the mover picks the child with the
+        # highest own value (first child on ties). Returns (values, choice):
+        # values[v] is the payoff vector reached from v, choice[v] the chosen
+        # child of v (-1 at leaves).
+        n = self.n_nodes
+        values = np.empty((n, self.n_players), dtype=float)
+        is_leaf = self.leaf_index >= 0
+        values[is_leaf] = self.payoffs[self.leaf_index[is_leaf]]
+        choice = np.full(n, -1, dtype=self.parent.dtype)
+
+        for d in range(len(self.level_offset) - 2, -1, -1):
+            level = np.arange(self.level_offset[d], self.level_offset[d + 1])
+            nodes = level[self.child_count[level] > 0]
+            if nodes.size == 0:
+                continue
+            first, last = self.child_offset[nodes[0]], self.child_offset[nodes[-1] + 1]
+            children = np.arange(first, last)
+            counts = self.child_count[nodes]
+            starts = self.child_offset[nodes] - first
+
+            movers = np.repeat(self.player[nodes], counts)
+            own = values[children, movers]
+            best = np.maximum.reduceat(own, starts)
+            positions = np.where(own == np.repeat(best, counts), np.arange(len(children)), len(children))
+            picked = children[np.minimum.reduceat(positions, starts)]
+
+            choice[nodes] = picked
+            values[nodes] = values[picked]
+        return values, choice
+
+    def action_codes(self, actions):
+        # Indices into action_labels for an array of labels; integer arrays are
+        # taken as indices already. Padding ('' or a None object, never the
+        # label 'None') maps to -1 and unknown labels to -2.
+        actions = np.asarray(actions)
+        if actions.dtype.kind in 'iu':
+            return actions.astype(np.int64)
+        if self._labels is None:
+            labels = np.array([str(label) for label in self.action_labels])
+            order = np.argsort(labels)
+            self._labels = (labels[order], order)
+        labels, order = self._labels
+        text = actions.astype(str)
+        pos = np.minimum(np.searchsorted(labels, text), len(labels) - 1)
+        codes = np.where(labels[pos] == text, order[pos], -2)
+        padding = text == ''
+        if actions.dtype == object:
+            padding |= np.equal(actions, None)
+        codes[padding] = -1
+        return codes
+
+    def _edge_index(self):
+        # Edge keys parent * n_labels + action sorted, with the child of each
+        if self._edges is None:
+            n_labels = max(len(self.action_labels), int(self.action.max()) + 1)
+            keys = self.parent[1:].astype(np.int64) * n_labels + self.action[1:]
+            order = np.argsort(keys, kind='stable')
+            self._edges = (n_labels, keys[order], order + 1)
+        return self._edges
+
+    def simulate(self, actions):
+        # Play M action sequences from the root in one pass per depth. actions
+        # is an (M, depth) array of action labels or label indices, padded with
+        # -1 (or '') once a sequence has reached its leaf. Returns (leaves,
+        # payoffs, paths): the leaf node of each sequence, its payoff row and
+        # the (M, depth) nodes entered at every step (-1 after the leaf). The
+        # edges of row k are (parent[v], v) for v >= 0 in paths[k].
+        # Raises ValueError naming the offending rows if any sequence uses an
+        # unknown or unavailable action, stops early or runs past its leaf.
+        codes = self.action_codes(actions)
+        if codes.ndim == 1:
+            codes = codes[:, None]
+        m, depth = codes.shape
+        n_labels, keys, children = self._edge_index()
+
+        current = np.zeros(m, dtype=np.int64)
+        paths = np.full((m, depth), -1, dtype=self.parent.dtype)
+        invalid = np.zeros(m, dtype=bool)
+        for d in range(depth):
+            a = codes[:, d]
+            moving = self.child_count[current] > 0
+            invalid |= (a == -2) | (a >= n_labels) | (~moving & (a != -1))
+            if d > 0:
+                invalid |= (a >= 0) & (codes[:, d - 1] < 0)
+            rows = np.flatnonzero(moving & (a >= 0) & (a < n_labels))
+            if keys.size == 0:
+                invalid[rows] = True
+                continue
+            key = current[rows] * n_labels + a[rows]
+            pos = np.minimum(np.searchsorted(keys, key), keys.size - 1)
+            found = keys[pos] == key
+            invalid[rows[~found]] = True
+            rows = rows[found]
+            current[rows] = children[pos[found]]
+            paths[rows, d] = current[rows]
+        invalid |= self.child_count[current] > 0
+
+        if invalid.any():
+            bad = np.flatnonzero(invalid)
+            raise ValueError(f"{bad.size} of {m} action sequences are invalid, e.g. rows {bad[:10].tolist()}")
+        return current, self.payoffs[self.leaf_index[current]], paths
+
+    def path_edges(self, path):
+        # (parent, child) edges of one row of simulate()'s paths, by node name
+        # when the tree has them, ready for Rendering.render_tree
+        names = getattr(self, 'node_names', None)
+        edges = [(int(self.parent[v]), int(v)) for v in np.asarray(path).tolist() if v >= 0]
+        if names is None:
+            return edges
+        return [(names[u], names[v]) for u, v in edges]
+
+    def equilibrium_path(self, choice=None):
+        # Nodes and action labels played from the root under `choice`
+        if choice is None:
+            _, choice = self.backward_induction()
+        path = [0]
+        while choice[path[-1]] >= 0:
+            path.append(int(choice[path[-1]]))
+        return path, [self.action_labels[self.action[v]] for v in path[1:]]
@@ -0,0 +1,120 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Opt-in counters and phase timers for the solvers.
+#
+#   with instrument() as recorder:
+#       rationalizable_strategies(df)
+#   print(recorder.report())
+#
+# Solvers call count() and phase() at their hot spots. Outside an
+# instrument() block both return immediately (one global lookup), so the
+# hooks cost next to nothing when instrumentation is off. instrument() can
+# also wrap the block in cProfile and/or tracemalloc.
+
+_active = None
+_null_phase = nullcontext()
+
+
+def enabled():
+    return _active is not None
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.counters[name] += n
+
+
+def phase(name):
+    if _active is None:
+        return _null_phase
+    return _active.timer(name)
+
+
+class Recorder:
+    __slots__ = ('counters', 'timers', 'calls', 'profile', 'memory', 'wall')
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.profile = None
+        self.memory = None
+        self.wall = 0.0
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def report(self, top=10):
+        # Structured report: counters, per phase seconds and calls, and the
+        # optional profiler and memory summaries
+        report = {
+            'wall_seconds': self.wall,
+            'counters': dict(self.counters),
+            'phases': {
+                name: {'seconds': self.timers[name], 'calls': self.calls[name]}
+                for name in sorted(self.timers, key=self.timers.get, reverse=True)
+            },
+        }
+        if self.profile is not None:
+            import pstats
+
+            stats = pstats.Stats(self.profile)
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            report['profile'] = [
+                {'function': f"{file}:{line}({func})", 'calls': calls, 'cumulative_seconds': cumulative}
+                for (file, line, func), (_, calls, _, cumulative, _) in entries
+            ]
+        if self.memory is not None:
+            snapshot, peak = self.memory
+            report['memory'] = {
+                'peak_bytes': peak,
+                'top': [
+                    {'location': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                    for stat in snapshot.statistics('lineno')[:top]
+                ],
+            }
+        return report
+
+
+@contextmanager
+def instrument(profile=False, trace_memory=False):
+    # Enable instrumentation for the enclosed block. Blocks do not nest: an
+    # inner instrument() records into its own Recorder until it exits.
+    global _active
+    previous = _active
+    recorder = Recorder()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    if trace_memory:
+        import tracemalloc
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    _active = recorder
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            recorder.profile = profiler
+        recorder.wall = time.perf_counter() - start
+        _active = previous
+        if trace_memory:
+            recorder.memory = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,287 @@
+import itertools
+from fractions import Fraction
+
+import numpy as np
+
+from Payoff_Tensor import df_to_tensor
+
+# Mixed strategy Nash equilibria of two player (bimatrix) games.
+# A holds the payoffs of player 1 (rows) and B those of player 2 (columns),
+# so a (n1, n2, 2) payoff tensor splits into A = payoffs[..., 0], B = payoffs[..., 1].
+#
+# Two methods are available:
+#   - lemke_howson: complementary pivoting, returns one equilibrium quickly
+#     and handles games of 50x50 and beyond.
+#   - support_enumeration: all equilibria of nondegenerate games, enumerating
+#     equal sized support pairs and pruning supports that contain conditionally
+#     dominated strategies.
+# Both run on floats by default; exact=True switches to Fraction arithmetic.
+
+TOL = 1e-9
+
+
+def _to_exact(M):
+    M = np.asarray(M)
+    out = np.empty(M.shape, dtype=object)
+    for idx, value in np.ndenumerate(M):
+        out[idx] = Fraction(value.item() if hasattr(value, 'item') else value)
+    return out
+
+
+def _prepare(A, B, exact):
+    if exact:
+        return _to_exact(A), _to_exact(B)
+    return np.asarray(A, dtype=float), np.asarray(B, dtype=float)
+
+
+def _dominated_rows(sub):
+    # dominated[r] is True when some row t of sub is strictly greater than row r
+    # in every column
+    return np.all(sub[:, None, :] > sub[None, :, :], axis=2).any(axis=0)
+
+
+def _strictly_dominated(M, alive_own, alive_other):
+    # Pure strategies (rows of M) strictly dominated by another alive row,
+    # comparing only over the alive columns
+    rows = np.flatnonzero(alive_own)
+    dominated = np.zeros(len(alive_own), dtype=bool)
+    dominated[rows] = _dominated_rows(M[np.ix_(rows, np.flatnonzero(alive_other))])
+    return dominated
+
+
+def iterated_strict_dominance(A, B):
+    # Alive masks for rows and columns after iterated elimination of strictly
+    # dominated pure strategies. Never removes a strategy used in equilibrium.
+    alive_rows = np.ones(A.shape[0], dtype=bool)
+    alive_cols = np.ones(A.shape[1], dtype=bool)
+    while True:
+        dom_rows = _strictly_dominated(A, alive_rows, alive_cols)
+        dom_cols = _strictly_dominated(B.T, alive_cols, alive_rows)
+        if not dom_rows.any() and not dom_cols.any():
+            return alive_rows, alive_cols
+        alive_rows &= ~dom_rows
+        alive_cols &= ~dom_cols
+
+
+def _solve_exact(M, rhs):
+    # Gauss-Jordan elimination over Fractions, None when M is singular
+    n = len(rhs)
+    aug = [list(M[r]) + [rhs[r]] for r in range(n)]
+    for c in range(n):
+        pivot = next((r for r in range(c, n) if aug[r][c] != 0), None)
+        if pivot is None:
+            return None
+        aug[c], aug[pivot] = aug[pivot], aug[c]
+        p = aug[c][c]
+        aug[c] = [v / p for v in aug[c]]
+        for r in range(n):
+            if r != c and aug[r][c] != 0:
+                f = aug[r][c]
+                aug[r] = [v - f * w for v, w in zip(aug[r], aug[c])]
+    return [aug[r][n] for r in range(n)]
+
+
+def _indifference_strategy(M, support_own, support_other, exact):
+    # Mixture over support_other that makes the owner of M indifferent between
+    # all strategies in support_own: M[I, J] p = v, sum(p) = 1.
+    # Returns (p over support_other, v) or None.
+    k = len(support_other)
+    sub = M[np.ix_(support_own, support_other)]
+    system = np.zeros((len(support_own) + 1, k + 1), dtype=object if exact else float)
+    system[:-1, :k] = sub
+    system[:-1, k] = -1
+    system[-1, :k] = 1
+    system[-1, k] = 0
+    rhs = [0] * len(support_own) + [1]
+
+    if exact:
+        solution = _solve_exact(system, [Fraction(v) for v in rhs])
+        if solution is None:
+            return None
+        return np.array(solution[:k], dtype=object), solution[k]
+
+    try:
+        solution = np.linalg.solve(system, np.array(rhs, dtype=float))
+    except np.linalg.LinAlgError:
+        return None
+    return solution[:k], solution[k]
+
+
+def _is_best_response(M, strategy, support, value, exact):
+    # Payoff of every pure strategy against `strategy` is at most `value`
+    payoffs = M[:, support].dot(strategy)
+    if exact:
+        return all(p <= value for p in payoffs)
+    return bool(np.all(payoffs <= value + TOL))
+
+
+def _conditionally_dominated(M, given):
+    # Rows of M strictly dominated by another row when the opponent is
+    # restricted to the strategies in `given`
+    return _dominated_rows(M[:, given])
+
+
+def support_enumeration(A, B, exact=False, max_support=None, prune=True):
+    # Generator over the equilibria (x, y) of a nondegenerate bimatrix game.
+    # With prune=True strictly dominated strategies are removed first and
+    # supports containing conditionally dominated strategies are skipped.
+    A, B = _prepare(A, B, exact)
+    n1, n2 = A.shape
+
+    if prune:
+        alive_rows, alive_cols = iterated_strict_dominance(A, B)
+    else:
+        alive_rows, alive_cols = np.ones(n1, dtype=bool), np.ones(n2, dtype=bool)
+    rows = np.flatnonzero(alive_rows)
+    cols = np.flatnonzero(alive_cols)
+    A_sub, B_sub = A[np.ix_(rows, cols)], B[np.ix_(rows, cols)]
+
+    largest = min(len(rows), len(cols))
+    if max_support is not None:
+        largest = min(largest, max_support)
+
+    for k in range(1, largest + 1):
+        for I in itertools.combinations(range(len(rows)), k):
+            I = list(I)
+            candidate_cols = range(len(cols))
+            if prune and k < len(cols):
+                dominated = _conditionally_dominated(B_sub.T, I)
+                candidate_cols = [j for j in range(len(cols)) if not dominated[j]]
+            for J in itertools.combinations(candidate_cols, k):
+                J = list(J)
+                if prune and np.any(_conditionally_dominated(A_sub, J)[I]):
+                    continue
+
+                col_part = _indifference_strategy(A_sub, I, J, exact)
+                row_part = _indifference_strategy(B_sub.T, J, I, exact)
+                if col_part is None or row_part is None:
+                    continue
+                y, v = col_part
+                x, u = row_part
+                if exact:
+                    if any(p < 0 for p in x) or any(p < 0 for p in y):
+                        continue
+                elif np.any(x < -TOL) or np.any(y < -TOL):
+                    continue
+                if not _is_best_response(A_sub, y, J, v, exact):
+                    continue
+                if not _is_best_response(B_sub.T, x, I, u, exact):
+                    continue
+
+                full_x = np.zeros(n1, dtype=object if exact else float)
+                full_y = np.zeros(n2, dtype=object if exact else float)
+                if exact:
+                    full_x[:] = Fraction(0)
+                    full_y[:] = Fraction(0)
+                full_x[rows[I]] = x
+                full_y[cols[J]] = y
+                if not exact:
+                    full_x = np.clip(full_x, 0, None)
+                    full_y = np.clip(full_y, 0, None)
+                yield full_x, full_y
+
+
+def _pivot(tableau, basis, entering, slack_columns, exact):
+    # One complementary pivot: `entering` joins the basis, the leaving label
+    # is chosen by the minimum ratio test with lexicographic tie breaking.
+    column = tableau[:, entering].copy()
+    if exact:
+        candidates = [r for r in range(len(basis)) if column[r] > 0]
+    else:
+        candidates = [r for r in range(len(basis)) if column[r] > TOL]
+    if not candidates:
+        raise ValueError("Lemke-Howson pivot found an unbounded ray; the game may be degenerate")
+
+    def key(r):
+        lead = [tableau[r, -1]] + list(tableau[r, slack_columns])
+        return [v / column[r] for v in lead]
+
+    row = min(candidates, key=key)
+    leaving = basis[row]
+
+    tableau[row] = tableau[row] / column[row]
+    for r in range(len(basis)):
+        if r != row and column[r] != 0:
+            tableau[r] = tableau[r] - tableau[r, entering] * tableau[row]
+    basis[row] = entering
+    return leaving
+
+
+def lemke_howson(A, B, initial_dropped_label=0, exact=False):
+    # One equilibrium (x, y) by complementary pivoting. Labels 0..n1-1 are the
+    # row strategies and n1..n1+n2-1 the column strategies; each start label
+    # can lead to a different equilibrium.
+    A, B = _prepare(A, B, exact)
+    n1, n2 = A.shape
+    if not 0 <= initial_dropped_label < n1 + n2:
+        raise ValueError(f"initial_dropped_label must be in [0, {n1 + n2})")
+
+    # Shift payoffs to be positive; this does not change the equilibria
+    shift_A = 1 - A.min() if A.min() <= 0 else 0
+    shift_B = 1 - B.min() if B.min() <= 0 else 0
+    A = A + shift_A
+    B = B + shift_B
+
+    dtype = object if exact else float
+    one = Fraction(1) if exact else 1.0
+    zero = Fraction(0) if exact else 0.0
+
+    # Player 1 polytope B^T x + s = 1 with x labels 0..n1-1, s labels n1..
+    row_tableau = np.full((n2, n1 + n2 + 1), zero, dtype=dtype)
+    row_tableau[:, :n1] = B.T
+    row_tableau[:, n1:n1 + n2] = np.eye(n2, dtype=int)
+    row_tableau[:, -1] = one
+    row_basis = list(range(n1, n1 + n2))
+    row_slacks = list(range(n1, n1 + n2))
+
+    # Player 2 polytope A y + r = 1 with r labels 0..n1-1, y labels n1..
+    col_tableau = np.full((n1, n1 + n2 + 1), zero, dtype=dtype)
+    col_tableau[:, :n1] = np.eye(n1, dtype=int)
+    col_tableau[:, n1:n1 + n2] = A
+    col_tableau[:, -1] = one
+    col_basis = list(range(n1))
+    col_slacks = list(range(n1))
+
+    if exact:
+        row_tableau = np.vectorize(Fraction, otypes=[object])(row_tableau)
+        col_tableau = np.vectorize(Fraction, otypes=[object])(col_tableau)
+
+    tableaux = [(row_tableau, row_basis, row_slacks), (col_tableau, col_basis, col_slacks)]
+    turn = 0 if initial_dropped_label < n1 else 1
+    entering = initial_dropped_label
+    while True:
+        tableau, basis, slacks = tableaux[turn]
+        leaving = _pivot(tableau, basis, entering, slacks, exact)
+        if leaving == initial_dropped_label:
+            break
+        entering = leaving
+        turn = 1 - turn
+
+    x = np.full(n1, zero, dtype=dtype)
+    y = np.full(n2, zero, dtype=dtype)
+    for r, label in enumerate(row_basis):
+        if label < n1:
+            x[label] = row_tableau[r, -1]
+    for r, label in enumerate(col_basis):
+        if label >= n1:
+            y[label - n1] = col_tableau[r, -1]
+    return x / x.sum(), y / y.sum()
+
+
+def find_mixed_nash_equilibria(df, method='support', exact=False, **kwargs):
+    # Mixed equilibria of a tuple-cell DataFrame game as a list of
+    # (player 1 strategy, player 2 strategy) dicts mapping labels to probabilities.
+    payoffs, labels = df_to_tensor(df)
+    A, B = payoffs[..., 0], payoffs[..., 1]
+
+    if method == 'support':
+        equilibria = list(support_enumeration(A, B, exact=exact, **kwargs))
+    elif method == 'lemke_howson':
+        equilibria = [lemke_howson(A, B, exact=exact, **kwargs)]
+    else:
+        raise ValueError("method must be 'support' or 'lemke_howson'")
+
+    return [
+        (dict(zip(labels[0], x.tolist())), dict(zip(labels[1], y.tolist())))
+        for x, y in equilibria
+    ]
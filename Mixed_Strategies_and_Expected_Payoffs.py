@@ -1,21 +1,93 @@
-import itertools
+import numpy as np
 
-def calculate_N_payoffs(player_index: int, payoff_table: dict[tuple, tuple], mixed_strategies: list[dict], decimals: int = 2):
-    players = range(len(mixed_strategies))
-    all_strategies = [list(mixed_strategies[i].keys()) for i in players]
+from Instrumentation import count, phase
+from Payoff_Tensor import table_to_tensor
+
+def expected_payoffs(payoffs: np.ndarray, mixed: list) -> np.ndarray:
+    # Expected payoff of every player, contracting the (n1, ..., nN, N) payoff
+    # tensor with one probability vector per player, one axis at a time.
+    # Each mixed[i] is either a single (n_i,) vector or a batch of shape (M, n_i);
+    # the result is (N,) for single profiles and (M, N) for batches.
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    if len(mixed) != n_players:
+        raise ValueError("mixed must hold one probability vector per player")
+
+    probs = [np.asarray(p, dtype=float) for p in mixed]
+    batched = any(p.ndim == 2 for p in probs)
+    if batched:
+        batch = max(p.shape[0] for p in probs if p.ndim == 2)
+        probs = [np.broadcast_to(p, (batch, p.shape[-1])) for p in probs]
+    else:
+        probs = [p[None, :] for p in probs]
+
+    count('expected_payoffs.mixed_profiles', probs[0].shape[0])
+    count('expected_payoffs.pure_profiles', probs[0].shape[0] * (payoffs.size // n_players))
+
+    # First contraction is a plain matrix product, the rest are batched
+    # (m, n_i, rest) x (m, n_i) reductions
+    rest = payoffs.reshape(payoffs.shape[0], -1)
+    result = probs[0] @ rest
+    for i in range(1, n_players):
+        result = result.reshape(result.shape[0], payoffs.shape[i], -1)
+        result = np.einsum('mi,mir->mr', probs[i], result)
 
-    expected_payoff = 0.0
+    return result if batched else result[0]
 
-    for profile in itertools.product(*all_strategies):
-        print(profile)
+def action_payoffs(payoffs: np.ndarray, mixed: list, player_index: int) -> np.ndarray:
+    # Expected payoff of each pure strategy of player_index when the other
+    # players use their (M, n_j) mixed strategies; returns an (M, n_player) array.
+    # mixed[player_index] is ignored.
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    own = np.moveaxis(payoffs[..., player_index], player_index, -1)
+    others = [np.atleast_2d(np.asarray(mixed[j], dtype=float)) for j in range(n_players) if j != player_index]
+    if not others:
+        return own[None, :]
+    batch = max(p.shape[0] for p in others)
+    others = [np.broadcast_to(p, (batch, p.shape[-1])) for p in others]
 
-        prob = 1.0
-        for i, action in enumerate(profile):
-            prob *= mixed_strategies[i][action]
-        payoff = payoff_table[profile][player_index]
-        expected_payoff += prob * payoff
+    result = others[0] @ own.reshape(own.shape[0], -1)
+    for j, probs in enumerate(others[1:], start=1):
+        result = result.reshape(batch, own.shape[j], -1)
+        result = np.einsum('mi,mir->mr', probs, result)
+    return result
+
+def batch_expected_payoffs(payoffs: np.ndarray, probs: list, chunk_size: int | None = None,
+                           max_memory: int = 256 * 2**20, out: np.ndarray | None = None) -> np.ndarray:
+    # Expected payoffs of M mixed profiles given as one (M, n_i) probability
+    # array per player; returns an (M, N) array. Profiles are streamed through
+    # expected_payoffs in chunks so the intermediate (chunk, n2 * ... * nN * N)
+    # contraction stays under max_memory bytes. `out` may be a preallocated
+    # array or np.memmap when M is too large to keep the result in memory.
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    if len(probs) != n_players:
+        raise ValueError("probs must hold one (M, n_i) array per player")
+    n_profiles = probs[0].shape[0]
+    if any(p.shape[0] != n_profiles for p in probs):
+        raise ValueError("every player's probability array must have the same number of rows")
+
+    if chunk_size is None:
+        row_bytes = 8 * payoffs.size // payoffs.shape[0]
+        chunk_size = max(1, max_memory // max(row_bytes, 1))
+    if out is None:
+        out = np.empty((n_profiles, n_players), dtype=float)
+
+    for start in range(0, n_profiles, chunk_size):
+        stop = min(start + chunk_size, n_profiles)
+        out[start:stop] = expected_payoffs(payoffs, [p[start:stop] for p in probs])
+    return out
+
+def calculate_N_payoffs(player_index: int, payoff_table: dict[tuple, tuple], mixed_strategies: list[dict], decimals: int = 2):
+    all_strategies = [list(strategy.keys()) for strategy in mixed_strategies]
+    with phase('calculate_N_payoffs.to_tensor'):
+        payoffs, _ = table_to_tensor(payoff_table, all_strategies)
+    probs = [[strategy[action] for action in strategy] for strategy in mixed_strategies]
 
-    return round(expected_payoff, decimals)
+    with phase('calculate_N_payoffs.contract'):
+        expected_payoff = expected_payoffs(payoffs, probs)[player_index]
+    return round(float(expected_payoff), decimals)
 
 def test_calc_N_payoffs():
     payoff_table = {
@@ -1,8 +1,10 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import sys
 sys.dont_write_bytecode = True
 
+from Instrumentation import count, phase
+from Payoff_Tensor import default_labels, df_to_tensor, profiles_to_labels, table_to_tensor
+
 # strategies_p1 = ['C', 'D']
 # strategies_p2 = ['C', 'D']
 
@@ -32,29 +34,101 @@ sys.dont_write_bytecode = True
 # plt.title("Prisoner's Dilemma Payoff Matrix")
 # plt.show()
 
+def best_response_mask(payoffs, player_index):
+    # Boolean tensor marking the cells where player_index plays a best response
+    # to the strategies of the others: one max reduction along the player's axis.
+    own = payoffs[..., player_index]
+    count('nash.cells_visited', own.size)
+    return own == own.max(axis=player_index, keepdims=True)
+
+def find_nash_equilibria_tensor(payoffs):
+    # Pure Nash equilibria of a (n1, ..., nN, N) payoff tensor as a (k, N) array
+    # of strategy indices: the cells that are a best response for every player
+    # at once. For two players this is the intersection of the column-wise best
+    # responses of player 1 with the row-wise best responses of player 2.
+    payoffs = np.asarray(payoffs)
+    n_players = payoffs.shape[-1]
+    if payoffs.ndim != n_players + 1:
+        raise ValueError("payoff tensor must have shape (n1, ..., nN, N)")
+    mask = best_response_mask(payoffs, 0)
+    for i in range(1, n_players):
+        mask &= best_response_mask(payoffs, i)
+    return np.argwhere(mask)
+
+def find_pure_nash_equilibria(game, strategies=None):
+    # N player pure Nash equilibria of either a payoff_table dict
+    # {(a_1, ..., a_N): (u_1, ..., u_N)} or a payoff tensor. Returns a dict
+    # mapping each equilibrium profile to its payoff tuple.
+    if isinstance(game, dict):
+        payoffs, strategies = table_to_tensor(game, strategies)
+    else:
+        payoffs = np.asarray(game)
+        if strategies is None:
+            strategies = default_labels(payoffs.shape[:-1])
+    equilibria = find_nash_equilibria_tensor(payoffs)
+    return {
+        profile: tuple(payoffs[tuple(idx)].tolist())
+        for profile, idx in zip(profiles_to_labels(equilibria, strategies), equilibria)
+    }
+
+def _blocks(n1, n2, block_rows, block_cols):
+    for r0 in range(0, n1, block_rows):
+        for c0 in range(0, n2, block_cols):
+            yield r0, min(r0 + block_rows, n1), c0, min(c0 + block_cols, n2)
+
+def _block_shape(payoffs, block_rows, block_cols, max_memory):
+    # Full width row blocks by default, since rows are contiguous on disk
+    n1, n2 = payoffs.shape[:2]
+    if block_cols is None:
+        block_cols = n2
+    if block_rows is None:
+        row_bytes = block_cols * payoffs.shape[2] * payoffs.dtype.itemsize
+        block_rows = max(1, max_memory // max(row_bytes, 1))
+    return min(block_rows, n1), min(block_cols, n2)
+
+def iter_nash_equilibria_blocked(payoffs, block_rows=None, block_cols=None, max_memory=64 * 2**20):
+    # Streaming pure Nash equilibria of a (n1, n2, 2) tensor that may be an
+    # out-of-core np.memmap. Pass one reads every block once and keeps only
+    # player 1's maximum per column and player 2's maximum per row. Pass two
+    # re-reads the blocks and yields each (row, col) index pair matching both
+    # maxima. Peak memory is one block plus n1 + n2 floats.
+    n1, n2 = payoffs.shape[:2]
+    block_rows, block_cols = _block_shape(payoffs, block_rows, block_cols, max_memory)
+
+    col_max = np.full(n2, -np.inf)
+    row_max = np.full(n1, -np.inf)
+    for r0, r1, c0, c1 in _blocks(n1, n2, block_rows, block_cols):
+        block = np.asarray(payoffs[r0:r1, c0:c1])
+        np.maximum(col_max[c0:c1], block[..., 0].max(axis=0), out=col_max[c0:c1])
+        np.maximum(row_max[r0:r1], block[..., 1].max(axis=1), out=row_max[r0:r1])
+
+    for r0, r1, c0, c1 in _blocks(n1, n2, block_rows, block_cols):
+        block = np.asarray(payoffs[r0:r1, c0:c1])
+        mask = (block[..., 0] == col_max[None, c0:c1]) & (block[..., 1] == row_max[r0:r1, None])
+        for r, c in np.argwhere(mask).tolist():
+            yield r0 + r, c0 + c
+
+def iter_nash_equilibria_file(path, **kwargs):
+    # Equilibria of a game file (see Game_File) as label pairs, streamed from disk
+    from Game_File import load_game
+
+    payoffs, labels = load_game(path)
+    for r, c in iter_nash_equilibria_blocked(payoffs, **kwargs):
+        yield labels[0][r], labels[1][c]
+
 def get_best_responses(df, player_index):
-    best_responses = set()
-    if player_index == 0:  # Player 1
-        for col in df.columns:
-            col_values = [(row, df.loc[row, col][0]) for row in df.index]
-            max_val = max(v for r, v in col_values)
-            for r, v in col_values:
-                if v == max_val:
-                    best_responses.add((r, col))
-    else:  # Player 2
-        for row in df.index:
-            row_values = [(col, df.loc[row, col][1]) for col in df.columns]
-            max_val = max(v for c, v in row_values)
-            for c, v in row_values:
-                if v == max_val:
-                    best_responses.add((row, c))
-    return best_responses
+    with phase('nash.to_tensor'):
+        payoffs, labels = df_to_tensor(df)
+    with phase('nash.best_response_masks'):
+        mask = best_response_mask(payoffs, player_index)
+    return set(profiles_to_labels(np.argwhere(mask), labels))
 
 def find_nash_equilibria(df):
-    p1_br = get_best_responses(df, player_index=0)
-    p2_br = get_best_responses(df, player_index=1)
-    nash_eq = p1_br.intersection(p2_br)
-    return nash_eq
+    with phase('nash.to_tensor'):
+        payoffs, labels = df_to_tensor(df)
+    with phase('nash.best_response_masks'):
+        equilibria = find_nash_equilibria_tensor(payoffs)
+    return set(profiles_to_labels(equilibria, labels))
 
 # nash_eqs = find_nash_equilibria(df)
 
@@ -0,0 +1,84 @@
+import numpy as np
+
+# Dense payoff tensor representation of a normal form game.
+# A game with N players where player i has n_i strategies is stored as one
+# ndarray of shape (n_1, n_2, ..., n_N, N): payoffs[a_1, ..., a_N, i] is the
+# payoff of player i when the pure profile (a_1, ..., a_N) is played.
+# Strategy labels are kept separately as a list of lists, labels[i] being the
+# strategy names of player i in axis order.
+
+
+def df_to_tensor(df, dtype=None):
+    # Convert the tuple-cell DataFrame used across the project
+    # (rows = player 1, columns = player 2) into a (n1, n2, 2) tensor.
+    payoffs = np.asarray(df.values.tolist(), dtype=dtype)
+    if payoffs.ndim != 3:
+        raise ValueError("DataFrame cells must all be payoff tuples of the same length")
+    labels = [list(df.index), list(df.columns)]
+    return payoffs, labels
+
+
+def tensor_to_df(payoffs, labels=None):
+    import pandas as pd
+
+    payoffs = np.asarray(payoffs)
+    if payoffs.ndim != 3:
+        raise ValueError("Only two player tensors can be converted to a DataFrame")
+    if labels is None:
+        labels = default_labels(payoffs.shape[:-1])
+
+    data = [[tuple(cell.tolist()) for cell in row] for row in payoffs]
+    return pd.DataFrame(data, index=list(labels[0]), columns=list(labels[1]))
+
+
+def default_labels(shape):
+    return [[f"s{i + 1}_{a}" for a in range(n)] for i, n in enumerate(shape)]
+
+
+def profiles_to_labels(profiles, labels):
+    # Map rows of integer strategy indices (e.g. from np.argwhere) to label tuples
+    return [tuple(labels[i][a] for i, a in enumerate(profile)) for profile in np.asarray(profiles).tolist()]
+
+
+def table_to_tensor(payoff_table, strategies=None, dtype=None):
+    # Convert an N player payoff_table {(a_1, ..., a_N): (u_1, ..., u_N)}, the
+    # format taken by calculate_N_payoffs, into a dense tensor. Strategy order
+    # follows `strategies` when given, otherwise first appearance in the keys.
+    profiles = list(payoff_table.keys())
+    if not profiles:
+        raise ValueError("payoff_table is empty")
+    n_players = len(profiles[0])
+
+    if strategies is None:
+        strategies = [list(dict.fromkeys(profile[i] for profile in profiles)) for i in range(n_players)]
+    else:
+        strategies = [list(s) for s in strategies]
+    index = [{s: a for a, s in enumerate(player_strategies)} for player_strategies in strategies]
+
+    shape = tuple(len(s) for s in strategies)
+    # Profiles using strategies outside `strategies` are ignored
+    known = [all(s in index[i] for i, s in enumerate(profile)) for profile in profiles]
+    coords = np.array(
+        [[index[i][s] for i, s in enumerate(profile)] for profile, ok in zip(profiles, known) if ok],
+        dtype=np.intp,
+    ).reshape(-1, n_players)
+    values = np.asarray([v for v, ok in zip(payoff_table.values(), known) if ok], dtype=dtype)
+
+    filled = np.zeros(shape, dtype=bool)
+    filled[tuple(coords.T)] = True
+    if not filled.all():
+        raise ValueError("payoff_table does not define a payoff for every pure profile")
+
+    payoffs = np.empty(shape + (n_players,), dtype=values.dtype)
+    payoffs[tuple(coords.T)] = values
+    return payoffs, strategies
+
+
+def tensor_to_table(payoffs, labels=None):
+    payoffs = np.asarray(payoffs)
+    if labels is None:
+        labels = default_labels(payoffs.shape[:-1])
+    table = {}
+    for profile in np.ndindex(payoffs.shape[:-1]):
+        table[tuple(labels[i][a] for i, a in enumerate(profile))] = tuple(payoffs[profile].tolist())
+    return table
@@ -0,0 +1,166 @@
+import numpy as np
+
+from Nash_Equilibrium_Computation_and_Output import find_nash_equilibria_tensor
+from Payoff_Tensor import df_to_tensor, profiles_to_labels
+
+# Potential games on a (n1, ..., nN, N) payoff tensor.
+# A game has an exact potential phi when every unilateral deviation changes
+# the deviator's payoff and phi by the same amount:
+#   np.diff(payoffs[..., i], axis=i) == np.diff(phi, axis=i)   for every i
+# and a weighted potential when payoffs[..., i] / w_i has one. phi is built
+# by integrating the payoff differences along a path from profile (0, ..., 0)
+# and then checked against the condition above for every player at once.
+#
+# The pure Nash equilibria of a potential game are the profiles where phi is
+# maximal along every player's axis, so one tensor replaces the N best
+# response masks; the global maximum of phi is always one of them, and best
+# response dynamics on phi always stops at one.
+
+
+def _integrate(payoffs):
+    # phi(a) = sum_i u_i(a_1..a_i, 0..0) - u_i(a_1..a_{i-1}, 0, 0..0)
+    shape = payoffs.shape[:-1]
+    n_players = len(shape)
+    phi = np.zeros(shape)
+    for i in range(n_players):
+        # u_i with every later player at strategy 0, shape (n1, ..., ni)
+        own = payoffs[(slice(None),) * (i + 1) + (0,) * (n_players - i - 1) + (i,)]
+        step = own - own[..., :1]
+        phi += step.reshape(step.shape + (1,) * (n_players - i - 1))
+    return phi
+
+
+def _check(payoffs, phi, weights, tol):
+    # The np.diff condition, tested as u_i - w_i * phi being constant along
+    # axis i (one pass and two reductions per player)
+    for i in range(payoffs.shape[-1]):
+        if payoffs.shape[i] < 2:
+            continue
+        rest = payoffs[..., i] - weights[i] * phi
+        if np.max(rest.max(axis=i) - rest.min(axis=i)) > tol:
+            return False
+    return True
+
+
+def _mixed_difference(u, i, j):
+    return np.diff(np.diff(u, axis=i), axis=j)
+
+
+def potential_weights(payoffs, tol=1e-9):
+    # Weights w (w_0 = 1) a weighted potential would need, read off the mixed
+    # second differences of pairs of players: for players j and i around any
+    # 2x2 cycle, diff_ji(u_i) / diff_ji(u_j) = w_i / w_j. None when a ratio is
+    # not positive.
+    payoffs = np.asarray(payoffs, dtype=float)
+    n_players = payoffs.shape[-1]
+    weights = np.ones(n_players)
+    for i in range(1, n_players):
+        for j in range(i):
+            if payoffs.shape[i] < 2 or payoffs.shape[j] < 2:
+                continue
+            dj = _mixed_difference(payoffs[..., j], j, i)
+            k = np.argmax(np.abs(dj))
+            if abs(dj.flat[k]) <= tol:
+                continue
+            ratio = _mixed_difference(payoffs[..., i], j, i).flat[k] / dj.flat[k]
+            if ratio <= tol:
+                return None
+            weights[i] = weights[j] * ratio
+            break
+    return weights
+
+
+def potential(payoffs, weighted=False, tol=1e-9):
+    # (phi, weights) if the game is an exact (or, with weighted=True, a
+    # weighted) potential game, otherwise None
+    payoffs = np.asarray(payoffs, dtype=float)
+    if payoffs.ndim != payoffs.shape[-1] + 1:
+        raise ValueError("payoff tensor must have shape (n1, ..., nN, N)")
+    weights = np.ones(payoffs.shape[-1])
+    if weighted:
+        weights = potential_weights(payoffs, tol)
+        if weights is None:
+            return None
+    phi = _integrate(payoffs / weights)
+    scale = max(1.0, float(np.abs(payoffs).max(initial=0.0)))
+    if not _check(payoffs, phi, weights, tol * scale):
+        return None
+    return phi, weights
+
+
+def is_potential_game(payoffs, weighted=False, tol=1e-9):
+    return potential(payoffs, weighted, tol) is not None
+
+
+def _local_maxima(phi, tol):
+    mask = np.ones(phi.shape, dtype=bool)
+    for i in range(phi.ndim):
+        mask &= phi >= phi.max(axis=i, keepdims=True) - tol
+    return mask
+
+
+def _line(phi, profiles, i):
+    # phi along player i's axis through each profile, shape (k, n_i)
+    index = tuple(profiles[:, j, None] if j != i else np.arange(phi.shape[i])[None, :] for j in range(phi.ndim))
+    return phi[index]
+
+
+def best_response_dynamics(phi, starts=None, n_starts=16, max_steps=None, seed=None):
+    # Best response dynamics on phi from many start profiles at once: players
+    # move in turn to their best strategy (lowest index on ties) until nobody
+    # improves. Every strict improvement raises phi, so all runs stop at pure
+    # equilibria. Returns the distinct end profiles as a (k, N) array.
+    phi = np.asarray(phi)
+    shape = phi.shape
+    if starts is None:
+        rng = np.random.default_rng(seed)
+        starts = np.stack([rng.integers(0, n, size=n_starts) for n in shape], axis=1)
+        starts[0] = 0
+    profiles = np.array(starts, dtype=np.intp).reshape(-1, len(shape))
+    if max_steps is None:
+        max_steps = phi.size * len(shape)
+
+    for _ in range(max_steps):
+        moved = False
+        for i in range(len(shape)):
+            values = _line(phi, profiles, i)
+            best = values.argmax(axis=1)
+            current = values[np.arange(len(profiles)), profiles[:, i]]
+            improve = values[np.arange(len(profiles)), best] > current
+            if improve.any():
+                profiles[improve, i] = best[improve]
+                moved = True
+        if not moved:
+            break
+    return np.unique(profiles, axis=0)
+
+
+def potential_equilibria(phi, method='all', tol=1e-9, **kw):
+    # Pure equilibria from a potential: 'all' marks every profile where phi is
+    # maximal along each axis, 'argmax' returns the global maximisers only and
+    # 'dynamics' runs best_response_dynamics (kw: starts, n_starts, seed)
+    phi = np.asarray(phi)
+    if method == 'all':
+        return np.argwhere(_local_maxima(phi, tol))
+    if method == 'argmax':
+        return np.argwhere(phi >= phi.max() - tol)
+    if method == 'dynamics':
+        return best_response_dynamics(phi, **kw)
+    raise ValueError(f"Unknown method {method!r}")
+
+
+def find_equilibria(payoffs, method='all', weighted=True, tol=1e-9, **kw):
+    # Pure equilibria of a payoff tensor through its potential when it has
+    # one, else through find_nash_equilibria_tensor. Returns (equilibria as a
+    # (k, N) array of strategy indices, (phi, weights) or None).
+    found = potential(payoffs, weighted, tol)
+    if found is None:
+        return find_nash_equilibria_tensor(payoffs), None
+    return potential_equilibria(found[0], method, tol, **kw), found
+
+
+def find_nash_equilibria_potential(df, method='all'):
+    # Same result as find_nash_equilibria(df) for method='all'
+    payoffs, labels = df_to_tensor(df, dtype=float)
+    equilibria, _ = find_equilibria(payoffs, method)
+    return set(profiles_to_labels(equilibria, labels))
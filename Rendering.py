@@ -0,0 +1,204 @@
+import io
+from collections import OrderedDict
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Headless rendering of game trees and payoff tables.
+# Figures are built with the object oriented matplotlib API on the Agg canvas,
+# so no display backend or GUI event loop is needed (networkx still imports
+# pyplot inside nx.draw, but no pyplot figure is created). Output goes to a
+# file (format from the extension) or is returned as bytes (png, svg, pdf).
+#
+# TreeRenderer caches, per tree structure and layout, the positions, the node
+# and edge label maps and the drawn base figure. Re-rendering the same tree
+# only swaps the highlighted path artists, and nothing at all when the path is
+# unchanged.
+
+
+def _tree_key(tree):
+    nodes = tuple((node, tuple(sorted(attrs.items()))) for node, attrs in tree.nodes(data=True))
+    edges = tuple((u, v, d.get('action')) for u, v, d in tree.edges(data=True))
+    return nodes, edges
+
+
+def _pos_key(tree, pos):
+    # None stands for the default tree_layout
+    if pos is None:
+        return None
+    return tuple(tuple(float(x) for x in pos[node]) if node in pos else None for node in tree)
+
+
+def node_labels(tree):
+    # Same labels as Games.add_labels
+    labels = {}
+    for node, attr in tree.nodes(data=True):
+        if 'payoff' in attr:
+            labels[node] = f"{node}\nPayoff:{attr['payoff']}"
+        elif 'player' in attr:
+            labels[node] = f"{node}\n({attr['player']})"
+        else:
+            labels[node] = node
+    return labels
+
+
+def tree_layout(tree, root='Start'):
+    # Layered layout: root on top, each depth one row down, leaves spread
+    # evenly and parents centered over their children
+    pos = {}
+    depth = {root: 0}
+    order = [root]
+    for node in order:
+        for child in tree.successors(node):
+            depth[child] = depth[node] + 1
+            order.append(child)
+    max_depth = max(depth.values())
+
+    next_x = [0.0]
+
+    def place(node):
+        children = list(tree.successors(node))
+        if not children:
+            x = next_x[0]
+            next_x[0] += 1.0
+        else:
+            xs = [place(child) for child in children]
+            x = sum(xs) / len(xs)
+        pos[node] = (x, float(max_depth - depth[node]))
+        return x
+
+    place(root)
+    center = (next_x[0] - 1.0) / 2
+    return {node: (x - center, y) for node, (x, y) in pos.items()}
+
+
+def _output(fig, output, format):
+    FigureCanvasAgg(fig)
+    if output is None:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=format or 'png')
+        return buffer.getvalue()
+    fig.savefig(output, format=format)
+    return output
+
+
+class TreeRenderer:
+
+    def __init__(self, max_cached=32, figsize=(6.4, 4.8)):
+        self.max_cached = max_cached
+        self.figsize = figsize
+        # (structure key, layout key) -> dict(pos, labels, edge_labels, fig, ax, highlight, artist)
+        self._cache = OrderedDict()
+
+    def _entry(self, tree, pos):
+        import networkx as nx
+
+        key = _tree_key(tree), _pos_key(tree, pos)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry
+
+        if pos is None:
+            pos = tree_layout(tree)
+        labels = node_labels(tree)
+        edge_labels = {(u, v): d['action'] for u, v, d in tree.edges(data=True)}
+
+        fig = Figure(figsize=self.figsize)
+        ax = fig.add_subplot()
+        nx.draw(tree, pos, ax=ax, with_labels=False, node_color='lightgreen', node_size=2000, arrows=True)
+        nx.draw_networkx_labels(tree, pos, labels=labels, ax=ax)
+        nx.draw_networkx_edge_labels(tree, pos, edge_labels=edge_labels, ax=ax)
+        ax.set_title("Game tree")
+        ax.axis('off')
+
+        entry = {'pos': pos, 'labels': labels, 'edge_labels': edge_labels,
+                 'fig': fig, 'ax': ax, 'highlight': (), 'artist': None}
+        self._cache[key] = entry
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _set_highlight(self, tree, entry, highlight_path):
+        import networkx as nx
+
+        highlight = tuple(highlight_path or ())
+        if highlight == entry['highlight']:
+            return
+        artist = entry['artist']
+        if artist is not None:
+            for a in (artist if isinstance(artist, list) else [artist]):
+                a.remove()
+            entry['artist'] = None
+        if highlight:
+            entry['artist'] = nx.draw_networkx_edges(
+                tree, entry['pos'], edgelist=list(highlight), edge_color='red',
+                width=2, arrows=True, ax=entry['ax'],
+            )
+        entry['highlight'] = highlight
+
+    def figure(self, tree, pos=None, highlight_path=None):
+        entry = self._entry(tree, pos)
+        self._set_highlight(tree, entry, highlight_path)
+        return entry['fig']
+
+    def render(self, tree, pos=None, highlight_path=None, output=None, format=None):
+        # Render to `output` (path or file object) or return the image bytes
+        return _output(self.figure(tree, pos, highlight_path), output, format)
+
+
+def payoff_table_figure(df, title="Payoff Matrix", highlight_cells=None, figsize=(6.4, 4.8)):
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    ax.axis('off')
+    table = ax.table(
+        cellText=[[str(cell) for cell in row] for row in df.values],
+        rowLabels=[str(r) for r in df.index],
+        colLabels=[str(c) for c in df.columns],
+        cellLoc='center',
+        loc='center',
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(14)
+    table.scale(1.5, 1.5)
+
+    rows, cols = list(df.index), list(df.columns)
+    for r, c in highlight_cells or ():
+        table[rows.index(r) + 1, cols.index(c)].set_facecolor('cyan')
+    ax.set_title(title)
+    return fig
+
+
+def render_payoff_table(df, title="Payoff Matrix", highlight_cells=None, output=None, format=None):
+    return _output(payoff_table_figure(df, title, highlight_cells), output, format)
+
+
+_default_renderer = TreeRenderer()
+
+
+def render_tree(tree, pos=None, highlight_path=None, output=None, format=None):
+    return _default_renderer.render(tree, pos, highlight_path, output, format)
+
+
+def render_many(items, output, renderer=None):
+    # Write many games into one multi-page PDF in a single pass. Each item is
+    # either a tuple-cell DataFrame or a dict with 'tree' and optional 'pos',
+    # 'highlight_path' and 'title' keys.
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    renderer = renderer or _default_renderer
+    with PdfPages(output) as pdf:
+        for item in items:
+            if isinstance(item, dict):
+                fig = renderer.figure(item['tree'], item.get('pos'), item.get('highlight_path'))
+                ax = fig.axes[0]
+                default_title = ax.get_title()
+                ax.set_title(item.get('title', default_title))
+                FigureCanvasAgg(fig)
+                pdf.savefig(fig)
+                ax.set_title(default_title)
+            else:
+                fig = payoff_table_figure(item)
+                FigureCanvasAgg(fig)
+                pdf.savefig(fig)
+    return output
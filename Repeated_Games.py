@@ -0,0 +1,208 @@
+import numpy as np
+
+from Game_Registry import get_game
+
+# Round robin tournaments of the iterated Prisoner's Dilemma (or any 2x2
+# stage game), with every match advanced one round at a time in parallel.
+#
+# Each match has two seats; all 2P seats of the P matches live in flat state
+# arrays (last own move, last two opponent moves, defection counts), with the
+# opponent of seat k at seat (k + P) % 2P. A strategy is a vectorized rule
+# that maps the state of all seats it occupies to their next moves, so one
+# round costs one call per distinct rule, not one call per match.
+#
+# Moves are 0 = cooperate, 1 = defect. With noise > 0 each move is flipped
+# with that probability; discount < 1 weights round t by discount ** t.
+# The stage game is a (2, 2, 2) payoff tensor [row move, column move, player];
+# in every match the first seat plays the row and the second the column, so
+# asymmetric stage games (e.g. Battle of the Sexes) are scored per side.
+
+C, D = 0, 1
+
+# Stage payoffs of the registered prisoners_dilemma, indexed [own move, opponent move]
+PRISONERS_DILEMMA = get_game('prisoners_dilemma').payoffs.astype(float)
+
+
+class SeatView:
+    # State of the seats played by one rule in the current round
+    __slots__ = ('round', 'own_last', 'opp_last', 'opp_prev', 'own_defections', 'opp_defections', 'size')
+
+    def __init__(self, round, own_last, opp_last, opp_prev, own_defections, opp_defections):
+        self.round = round
+        self.own_last = own_last
+        self.opp_last = opp_last
+        self.opp_prev = opp_prev
+        self.own_defections = own_defections
+        self.opp_defections = opp_defections
+        self.size = len(own_last)
+
+
+def always_cooperate(view, params, rng):
+    return np.full(view.size, C, dtype=np.uint8)
+
+
+def always_defect(view, params, rng):
+    return np.full(view.size, D, dtype=np.uint8)
+
+
+def tit_for_tat(view, params, rng):
+    if view.round == 0:
+        return np.full(view.size, C, dtype=np.uint8)
+    return view.opp_last.copy()
+
+
+def suspicious_tit_for_tat(view, params, rng):
+    if view.round == 0:
+        return np.full(view.size, D, dtype=np.uint8)
+    return view.opp_last.copy()
+
+
+def tit_for_two_tats(view, params, rng):
+    return ((view.opp_last == D) & (view.opp_prev == D)).astype(np.uint8)
+
+
+def generous_tit_for_tat(view, params, rng):
+    # Tit for tat that forgives a defection with probability params['generosity']
+    moves = tit_for_tat(view, params, rng)
+    forgive = rng.random(view.size) < params['generosity']
+    moves[forgive] = C
+    return moves
+
+
+def grim_trigger(view, params, rng):
+    return (view.opp_defections > 0).astype(np.uint8)
+
+
+def pavlov(view, params, rng):
+    # Win-stay lose-shift: cooperate after matching moves, defect otherwise
+    if view.round == 0:
+        return np.full(view.size, C, dtype=np.uint8)
+    return (view.own_last != view.opp_last).astype(np.uint8)
+
+
+def random_strategy(view, params, rng):
+    return (rng.random(view.size) < params['p_defect']).astype(np.uint8)
+
+
+class Strategy:
+    __slots__ = ('name', 'rule', 'params')
+
+    def __init__(self, name, rule, **params):
+        self.name = name
+        self.rule = rule
+        self.params = params
+
+
+CLASSIC_STRATEGIES = {
+    'always_cooperate': Strategy('always_cooperate', always_cooperate),
+    'always_defect': Strategy('always_defect', always_defect),
+    'tit_for_tat': Strategy('tit_for_tat', tit_for_tat),
+    'suspicious_tit_for_tat': Strategy('suspicious_tit_for_tat', suspicious_tit_for_tat),
+    'tit_for_two_tats': Strategy('tit_for_two_tats', tit_for_two_tats),
+    'generous_tit_for_tat': Strategy('generous_tit_for_tat', generous_tit_for_tat, generosity=0.1),
+    'grim_trigger': Strategy('grim_trigger', grim_trigger),
+    'pavlov': Strategy('pavlov', pavlov),
+    'random': Strategy('random', random_strategy, p_defect=0.5),
+}
+
+
+def _resolve(strategies):
+    return [CLASSIC_STRATEGIES[s] if isinstance(s, str) else s for s in strategies]
+
+
+def play_tournament(strategies, rounds=1000, stage=PRISONERS_DILEMMA, noise=0.0, discount=1.0,
+                    self_play=True, seed=None, output=None, chunk_rounds=1024):
+    # Round robin over every pair of strategies (each strategy against itself
+    # too when self_play). Returns (names, scores) where scores[i, j] is the
+    # (discounted) average payoff per round of strategy i against strategy j.
+    # In the match of i < j, i plays the row of the stage game and j the
+    # column; in self play both seats are averaged.
+    # With `output`, the moves of every seat are streamed to a .npy file of
+    # shape (rounds, 2P) uint8, written in chunks of chunk_rounds, together
+    # with the seat layout in `<output>.seats.npy`.
+    strategies = _resolve(strategies)
+    stage = np.asarray(stage, dtype=float)
+    if stage.shape != (2, 2, 2):
+        raise ValueError("stage must be a (2, 2, 2) payoff tensor")
+    rng = np.random.default_rng(seed)
+    n = len(strategies)
+
+    first, second = np.triu_indices(n, k=0 if self_play else 1)
+    n_matches = len(first)
+    seat_strategy = np.concatenate([first, second])
+    opponent = np.concatenate([np.arange(n_matches, 2 * n_matches), np.arange(n_matches)])
+    row_seat = np.arange(2 * n_matches) < n_matches
+
+    # Group seats by rule once, with per-seat parameter arrays
+    groups = {}
+    for s, strategy in enumerate(strategies):
+        groups.setdefault(strategy.rule, []).append(s)
+    seat_groups = []
+    for rule, members in groups.items():
+        seats = np.flatnonzero(np.isin(seat_strategy, members))
+        names = set().union(*(strategies[s].params.keys() for s in members))
+        params = {
+            key: np.array([strategies[s].params[key] for s in seat_strategy[seats]], dtype=float)
+            for key in names
+        }
+        seat_groups.append((rule, seats, params))
+
+    size = 2 * n_matches
+    own_last = np.zeros(size, dtype=np.uint8)
+    opp_prev = np.zeros(size, dtype=np.uint8)
+    own_defections = np.zeros(size, dtype=np.int64)
+    totals = np.zeros(size, dtype=float)
+    moves = np.empty(size, dtype=np.uint8)
+
+    record = None
+    if output is not None:
+        record = np.lib.format.open_memmap(output, mode='w+', dtype=np.uint8, shape=(rounds, size))
+        np.save(f"{output}.seats.npy", np.stack([seat_strategy, seat_strategy[opponent]]))
+    buffer = np.empty((min(chunk_rounds, rounds), size), dtype=np.uint8)
+
+    weight = 1.0
+    weight_sum = 0.0
+    for t in range(rounds):
+        opp_last = own_last[opponent]
+        opp_defections = own_defections[opponent]
+        for rule, seats, params in seat_groups:
+            view = SeatView(t, own_last[seats], opp_last[seats], opp_prev[seats],
+                            own_defections[seats], opp_defections[seats])
+            moves[seats] = rule(view, params, rng)
+        if noise > 0:
+            flip = rng.random(size) < noise
+            moves[flip] ^= 1
+
+        opp_moves = moves[opponent]
+        # Row seats are paid from player 1's payoffs, column seats from player 2's
+        totals += weight * np.where(row_seat, stage[moves, opp_moves, 0], stage[opp_moves, moves, 1])
+        weight_sum += weight
+        weight *= discount
+
+        opp_prev = opp_last
+        own_last = moves.copy()
+        own_defections += moves
+
+        if record is not None:
+            buffer[t % len(buffer)] = moves
+            if t % len(buffer) == len(buffer) - 1 or t == rounds - 1:
+                start = t - t % len(buffer)
+                record[start:t + 1] = buffer[:t - start + 1]
+    if record is not None:
+        record.flush()
+        del record
+
+    per_round = totals / weight_sum
+    scores = np.zeros((n, n))
+    counts = np.zeros((n, n))
+    np.add.at(scores, (seat_strategy, seat_strategy[opponent]), per_round)
+    np.add.at(counts, (seat_strategy, seat_strategy[opponent]), 1)
+    scores = np.divide(scores, counts, out=np.full((n, n), np.nan), where=counts > 0)
+    return [s.name for s in strategies], scores
+
+
+def ranking(names, scores):
+    # Strategies sorted by their mean score over all opponents
+    mean = np.nanmean(scores, axis=1)
+    order = np.argsort(-mean)
+    return [(names[i], float(mean[i])) for i in order]
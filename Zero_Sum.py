@@ -0,0 +1,133 @@
+import numpy as np
+
+from Payoff_Tensor import df_to_tensor
+
+# Two player constant-sum games (payoffs[..., 0] + payoffs[..., 1] == c in
+# every cell). Such a game is decided by the matrix A = payoffs[..., 0] of
+# the row player: both players' optimal (minimax) strategies and the value
+# come from one LP,
+#   maximize v  s.t.  sum_i x_i A[i, j] >= v for every column j,  sum x = 1,  x >= 0
+# whose constraint duals are the column player's optimal strategy. For
+# matrices too large for an LP, multiplicative_weights runs optimistic Hedge
+# for both players and stops once the duality gap drops below eps.
+#
+# Every equilibrium of a constant-sum game is a pair of minimax strategies,
+# so these solvers replace the general bimatrix methods of
+# Mixed_Nash_Equilibria.py for this class of games.
+
+TOL = 1e-9
+
+
+def constant_sum(payoffs, tol=TOL):
+    # The constant c if the payoffs of all players sum to c in every profile
+    # (0 for zero-sum games), otherwise None
+    payoffs = np.asarray(payoffs, dtype=float)
+    totals = payoffs.sum(axis=-1)
+    if totals.size == 0:
+        return 0.0
+    scale = max(1.0, float(np.abs(payoffs).max()))
+    if totals.max() - totals.min() > tol * scale:
+        return None
+    return float(totals.flat[0])
+
+
+def is_constant_sum(payoffs, tol=TOL):
+    return constant_sum(payoffs, tol) is not None
+
+
+def is_zero_sum(payoffs, tol=TOL):
+    c = constant_sum(payoffs, tol)
+    return c is not None and abs(c) <= tol * max(1.0, float(np.abs(np.asarray(payoffs)).max()))
+
+
+def minimax_lp(A):
+    # (value, x, y) for the row player's payoff matrix A from a single LP:
+    # x maximises the row player's guaranteed payoff, y (the duals of the
+    # column constraints) minimises what the row player can get
+    from scipy.optimize import linprog
+
+    A = np.asarray(A, dtype=float)
+    m, n = A.shape
+    c = np.zeros(m + 1)
+    c[-1] = -1.0
+    A_ub = np.hstack([-A.T, np.ones((n, 1))])
+    A_eq = np.ones((1, m + 1))
+    A_eq[0, -1] = 0.0
+    bounds = [(0, None)] * m + [(None, None)]
+    res = linprog(c, A_ub=A_ub, b_ub=np.zeros(n), A_eq=A_eq, b_eq=[1.0], bounds=bounds, method='highs')
+    if res.status != 0:
+        raise RuntimeError(f"minimax LP failed: {res.message}")
+    x = np.clip(res.x[:m], 0.0, None)
+    y = np.clip(-res.ineqlin.marginals, 0.0, None)
+    return -res.fun + 0.0, x / x.sum(), y / y.sum()
+
+
+def multiplicative_weights(A, eps=1e-3, max_iterations=100000, eta=1.0, check_every=50):
+    # Approximate minimax strategies by simultaneous optimistic Hedge updates
+    # of both players (each step uses 2 * current - previous payoff vector),
+    # with payoffs rescaled to [0, 1]. The time-averaged strategies are an
+    # eps-equilibrium once the duality gap
+    #   max_i (A y)_i - min_j (x A)_j
+    # (in the original payoff units) is at most eps. Each iteration costs two
+    # matrix-vector products. Returns (value, x, y, gap) with value the
+    # midpoint of the two bounds.
+    A = np.asarray(A, dtype=float)
+    m, n = A.shape
+    low, high = A.min(), A.max()
+    S = (A - low) / (high - low) if high > low else np.zeros_like(A)
+
+    log_x = np.zeros(m)
+    log_y = np.zeros(n)
+    x_sum = np.zeros(m)
+    y_sum = np.zeros(n)
+    last_x = np.zeros(m)
+    last_y = np.zeros(n)
+    for t in range(1, max_iterations + 1):
+        x = np.exp(log_x - log_x.max())
+        x /= x.sum()
+        y = np.exp(log_y - log_y.max())
+        y /= y.sum()
+        x_sum += x
+        y_sum += y
+        # Row player maximises S, column player minimises it
+        gain_x = S @ y
+        gain_y = x @ S
+        log_x += eta * (2 * gain_x - last_x)
+        log_y -= eta * (2 * gain_y - last_y)
+        last_x, last_y = gain_x, gain_y
+
+        if t % check_every == 0 or t == max_iterations:
+            upper = (A @ (y_sum / t)).max()
+            lower = ((x_sum / t) @ A).min()
+            if upper - lower <= eps:
+                break
+    return float(upper + lower) / 2, x_sum / t, y_sum / t, float(upper - lower)
+
+
+def solve_constant_sum(payoffs, method='lp', **kwargs):
+    # Values of both players and optimal strategies of a two player
+    # constant-sum tensor: ((v1, v2), x, y). method='mwu' uses
+    # multiplicative_weights (kwargs: eps, max_iterations, ...).
+    payoffs = np.asarray(payoffs, dtype=float)
+    if payoffs.ndim != 3 or payoffs.shape[-1] != 2:
+        raise ValueError("minimax solving needs a two player (n1, n2, 2) payoff tensor")
+    c = constant_sum(payoffs)
+    if c is None:
+        raise ValueError("game is not constant-sum")
+    A = payoffs[..., 0]
+    if method == 'lp':
+        value, x, y = minimax_lp(A)
+    elif method == 'mwu':
+        value, x, y, _ = multiplicative_weights(A, **kwargs)
+    else:
+        raise ValueError("method must be 'lp' or 'mwu'")
+    return (value, c - value), x, y
+
+
+def solve_zero_sum_df(df, method='lp', **kwargs):
+    # Tuple-cell DataFrame version: ((v1, v2), player 1 strategy, player 2
+    # strategy) with the strategies as dicts mapping labels to probabilities,
+    # like find_mixed_nash_equilibria
+    payoffs, labels = df_to_tensor(df, dtype=float)
+    values, x, y = solve_constant_sum(payoffs, method, **kwargs)
+    return values, dict(zip(labels[0], x.tolist())), dict(zip(labels[1], y.tolist()))
@@ -0,0 +1,74 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Mixed_Strategies_and_Expected_Payoffs import batch_expected_payoffs
+from Payoff_Tensor import default_labels, tensor_to_table
+
+# Compares batch_expected_payoffs against the original per-profile loop of
+# calculate_N_payoffs (kept below without its per-profile print), called once
+# per mixed profile per player on a random game.
+#   python benchmarks/bench_expected_payoffs.py --players 3 --actions 4 --profiles 1000000
+
+
+def loop_N_payoffs(player_index, payoff_table, mixed_strategies):
+    players = range(len(mixed_strategies))
+    all_strategies = [list(mixed_strategies[i].keys()) for i in players]
+
+    expected_payoff = 0.0
+
+    for profile in itertools.product(*all_strategies):
+        prob = 1.0
+        for i, action in enumerate(profile):
+            prob *= mixed_strategies[i][action]
+        payoff = payoff_table[profile][player_index]
+        expected_payoff += prob * payoff
+
+    return expected_payoff
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--actions', type=int, default=4)
+    parser.add_argument('--profiles', type=int, default=1_000_000)
+    parser.add_argument('--reference-profiles', type=int, default=2000,
+                        help="profiles run through the per-profile loop, extrapolated to --profiles")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    shape = (args.actions,) * args.players
+    payoffs = rng.random(shape + (args.players,))
+    labels = default_labels(shape)
+    table = tensor_to_table(payoffs, labels)
+    probs = [rng.dirichlet(np.ones(args.actions), size=args.profiles) for _ in range(args.players)]
+
+    start = time.perf_counter()
+    batch = batch_expected_payoffs(payoffs, probs)
+    batch_time = time.perf_counter() - start
+
+    n_ref = min(args.reference_profiles, args.profiles)
+    reference = np.empty((n_ref, args.players))
+    start = time.perf_counter()
+    for m in range(n_ref):
+        mixed = [dict(zip(labels[i], probs[i][m])) for i in range(args.players)]
+        for i in range(args.players):
+            reference[m, i] = loop_N_payoffs(i, table, mixed)
+    reference_time = (time.perf_counter() - start) * args.profiles / n_ref
+
+    max_error = np.abs(batch[:n_ref] - reference).max()
+    print(f"game: {args.players} players x {args.actions} actions, {args.profiles} profiles")
+    print(f"batch_expected_payoffs: {batch_time:.3f}s ({args.profiles / batch_time:,.0f} profiles/s)")
+    print(f"per-profile loop (extrapolated from {n_ref}): {reference_time:.3f}s")
+    print(f"speedup: {reference_time / batch_time:,.0f}x, max abs difference: {max_error:.2e}")
+
+
+if __name__ == '__main__':
+    main()
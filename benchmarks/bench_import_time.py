@@ -0,0 +1,88 @@
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+# Wall time of importing each analysis module in a fresh interpreter, the
+# cost paid by every short lived worker process. With --baseline REV the same
+# modules are also timed from that git revision to show the difference.
+#   python benchmarks/bench_import_time.py --baseline HEAD~1
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'Nash_Equilibrium_Computation_and_Output',
+    'Dominance_and_Rationalizability',
+    'Mixed_Strategies_and_Expected_Payoffs',
+    'games',
+    'Extensive_Form',
+]
+
+REFERENCE = {
+    'numpy': 'import numpy',
+    'plotting stack': 'import pandas, networkx, matplotlib.pyplot',
+}
+
+
+def time_import(statement, cwd, repeat):
+    times = []
+    for _ in range(repeat):
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"{statement}; "
+            "print(time.perf_counter() - start)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-B', '-c', code], cwd=cwd, capture_output=True, text=True,
+            env={**os.environ, 'MPLBACKEND': 'Agg'},
+        )
+        if result.returncode != 0:
+            return None
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def export_revision(rev, target):
+    archive = subprocess.run(['git', 'archive', rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def fmt(seconds):
+    return "   failed" if seconds is None else f"{seconds * 1000:8.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baseline', help="git revision to compare against")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        if args.baseline:
+            export_revision(args.baseline, baseline_dir)
+
+        for name, statement in REFERENCE.items():
+            print(f"{name:42s} {fmt(time_import(statement, ROOT, args.repeat))}")
+        print()
+
+        header = f"{'module':42s} {'current':>10s}"
+        if args.baseline:
+            header += f" {args.baseline:>10s} {'saved':>10s}"
+        print(header)
+        for module in MODULES:
+            current = time_import(f"import {module}", ROOT, args.repeat)
+            line = f"{module:42s} {fmt(current)}"
+            if args.baseline:
+                before = time_import(f"import {module}", baseline_dir, args.repeat)
+                saved = None if current is None or before is None else before - current
+                line += f" {fmt(before)} {fmt(saved)}"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
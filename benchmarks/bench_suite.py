@@ -0,0 +1,201 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Dominance_and_Rationalizability import best_responses, check_dominance, rationalizable_strategies
+from Mixed_Strategies_and_Expected_Payoffs import calculate_N_payoffs
+from Nash_Equilibrium_Computation_and_Output import find_nash_equilibria, get_best_responses
+from Payoff_Tensor import default_labels, tensor_to_df, tensor_to_table
+from games import Games
+
+# Times every solver entry point on random games of growing size and player
+# count, writes the results to JSON and compares two result files.
+#
+#   python benchmarks/bench_suite.py --output before.json
+#   python benchmarks/bench_suite.py --output after.json --compare before.json
+#
+# A case regresses when its median time is slower than the baseline's by
+# more than --threshold and by more than --min-slowdown seconds (so timer
+# noise on microsecond cases is not flagged), or when a function's scaling
+# exponent (log-log slope of time against game size, fitted on cases taking
+# at least --min-fit-time) grows by more than --slope-threshold.
+
+SIZES = [2, 4, 8, 16, 32, 64, 128]
+N_PLAYER_CASES = [(2, 4), (3, 4), (4, 4), (5, 4), (3, 8), (4, 8)]
+
+
+def random_df(n, rng):
+    return tensor_to_df(rng.integers(0, 100, size=(n, n, 2)))
+
+
+def measure(func, min_time=0.05, repeat=5):
+    # Best per-call time over `repeat` runs of enough calls to last min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return min(times), statistics.median(times)
+
+
+def two_player_cases(sizes, rng):
+    for n in sizes:
+        df = random_df(n, rng)
+        yield 'check_dominance', n, lambda df=df: check_dominance(1, df, 'weak')
+        yield 'best_responses', n, lambda df=df: best_responses(1, df)
+        yield 'rationalizable_strategies', n, lambda df=df: rationalizable_strategies(df)
+        yield 'get_best_responses', n, lambda df=df: get_best_responses(df, 0)
+        yield 'find_nash_equilibria', n, lambda df=df: find_nash_equilibria(df)
+
+
+def n_player_cases(cases, rng):
+    for players, actions in cases:
+        shape = (actions,) * players
+        labels = default_labels(shape)
+        table = tensor_to_table(rng.integers(0, 100, size=shape + (players,)), labels)
+        mixed = [dict(zip(labels[i], rng.dirichlet(np.ones(actions)))) for i in range(players)]
+        size = actions ** players
+        yield f'calculate_N_payoffs[{players}p]', size, lambda t=table, m=mixed: calculate_N_payoffs(0, t, m)
+
+
+def builder_cases():
+    games = Games()
+    builders = {
+        'Games.build_prisoners_dilemma': lambda: games.build_prisoners_dilemma('c', 'd'),
+        'Games.build_battle_of_sexes': lambda: games.build_battle_of_sexes('f', 'b'),
+        'Games.build_matching_pennies': lambda: games.build_matching_pennies('h', 't'),
+        'Games.build_hawk_dove': lambda: games.build_hawk_dove('h', 'd'),
+    }
+    for name, func in builders.items():
+        yield name, 4, func
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, seed, min_time):
+    rng = np.random.default_rng(seed)
+    cases = list(two_player_cases(sizes, rng)) + list(n_player_cases(N_PLAYER_CASES, rng)) + list(builder_cases())
+    results = []
+    for name, size, func in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            best, median = measure(func, min_time)
+        results.append({'name': name, 'size': size, 'best': best, 'median': median})
+        print(f"{name:38s} size {size:>8}  {best * 1e3:10.3f}ms", file=sys.stderr)
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'seed': seed,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def scaling_exponents(results, min_time=1e-3):
+    # Least squares slope of log(time) against log(size) per function. Cases
+    # faster than min_time are dominated by call overhead and left out.
+    by_name = {}
+    for r in results:
+        by_name.setdefault(r['name'], []).append((r['size'], r['best']))
+    slopes = {}
+    for name, points in by_name.items():
+        points = [(s, t) for s, t in points if s > 0 and t >= min_time]
+        if len({s for s, _ in points}) < 2:
+            continue
+        x = np.log([s for s, _ in points])
+        y = np.log([t for _, t in points])
+        slopes[name] = float(np.polyfit(x, y, 1)[0])
+    return slopes
+
+
+def compare(current, baseline, threshold, slope_threshold, min_slowdown=50e-6, min_fit_time=1e-3):
+    regressions = []
+    before = {(r['name'], r['size']): r.get('median', r['best']) for r in baseline['results']}
+    for r in current['results']:
+        old = before.get((r['name'], r['size']))
+        if old is None or old == 0:
+            continue
+        new = r.get('median', r['best'])
+        ratio = new / old
+        flag = ratio > threshold and new - old > min_slowdown
+        if flag:
+            regressions.append(f"{r['name']} size {r['size']}: {old * 1e3:.3f}ms -> {new * 1e3:.3f}ms ({ratio:.2f}x)")
+        print(f"{'REGRESSION' if flag else 'ok':10s} {r['name']:38s} size {r['size']:>8}  {ratio:6.2f}x")
+
+    old_slopes = scaling_exponents(baseline['results'], min_fit_time)
+    for name, slope in scaling_exponents(current['results'], min_fit_time).items():
+        if name in old_slopes and slope - old_slopes[name] > slope_threshold:
+            regressions.append(f"{name}: scaling exponent {old_slopes[name]:.2f} -> {slope:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="baseline JSON written by an earlier run")
+    parser.add_argument('--threshold', type=float, default=1.25)
+    parser.add_argument('--slope-threshold', type=float, default=0.3)
+    parser.add_argument('--min-slowdown', type=float, default=50e-6,
+                        help="smallest absolute slowdown in seconds that counts as a regression")
+    parser.add_argument('--min-fit-time', type=float, default=1e-3,
+                        help="cases faster than this are left out of the scaling fit")
+    parser.add_argument('--max-size', type=int, default=max(SIZES))
+    parser.add_argument('--min-time', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [n for n in SIZES if n <= args.max_size]
+    current = run(sizes, args.seed, args.min_time)
+    current['scaling'] = scaling_exponents(current['results'], args.min_fit_time)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    for name, slope in current['scaling'].items():
+        if not math.isnan(slope):
+            print(f"{name:38s} time ~ size^{slope:.2f}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.slope_threshold,
+                              args.min_slowdown, args.min_fit_time)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,21 @@
-import networkx as nx
-import numpy as np
-import matplotlib.pyplot as plt
+from Game_Registry import get_game
 
+# networkx and matplotlib are imported on first use so that payoff lookups
+# do not pay for loading the plotting stack. Payoffs, labels and trees come
+# from Game_Registry, where every game is defined once as data.
 
 
 class Games:
 
-    def plot_tree(self, tree, pos, node_labels, highlight_path=None):
+    def plot_tree(self, tree, pos, node_labels, highlight_path=None, output=None):
+        # Headless render to a file, with cached layout and labels
+        if output is not None:
+            from Rendering import render_tree
+            return render_tree(tree, pos, highlight_path, output=output)
+
+        import networkx as nx
+        import matplotlib.pyplot as plt
+
         # Draw all edges in default color
         nx.draw(tree, pos, with_labels=False, node_color='lightgreen', node_size=2000, arrows=True)
         nx.draw_networkx_labels(tree, pos, labels=node_labels)
@@ -41,6 +50,7 @@ class Games:
         return node_labels
 
     def build_game_tree(self, nodes, edges):
+            import networkx as nx
             game_tree = nx.DiGraph()
             for node, attrs in nodes:
                 game_tree.add_node(node, **attrs)
@@ -48,250 +58,38 @@ class Games:
                     game_tree.add_edge(u, v, **attrs)
             return game_tree
 
-    def build_prisoners_dilemma(self, p1_decision, p2_decision, show_plot=False):
-        
-
-        # create nodes
-        nodes = [
-            ("Start", {'player': 'p1', 'label': 'Start'}),
-            ('p1_c', {'player': 'p2'}),
-            ('p1_d', {'player': 'p2'}),
-            ('cc', {'payoff': (5, 5)}),
-            ('cd', {'payoff': (0, 20)}),
-            ('dc', {'payoff': (20, 0)}),
-            ('dd', {'payoff': (1, 1)}),
-        ]
-        edges = [
-            ('Start', 'p1_c', {'action': 'c'}),
-            ('Start', 'p1_d', {'action': 'd'}),
-            ('p1_c', 'cc', {'action': 'c'}),
-            ('p1_c', 'cd', {'action': 'd'}),
-            ('p1_d', 'dc', {'action': 'c'}),
-            ('p1_d', 'dd', {'action': 'd'}),
-        ]
-        game_tree = self.build_game_tree(nodes, edges)
-        node_labels = Games().add_labels(game_tree)
-        
-        pos = {
-            "Start": (0, 2),
-            "p1_c": (-1.5, 1),
-            "p1_d": (1.5, 1),
-            "cc": (-2, 0),
-            "cd": (-1, 0),
-            "dc": (1, 0),
-            "dd": (2, 0),
-        }
-
-
-        # Determine the path to highlight based on decisions
-        highlight_path = []
-        if p1_decision == 'c':
-            highlight_path.append(('Start', 'p1_c'))
-            if p2_decision == 'c':
-                highlight_path.append(('p1_c', 'cc'))
-            elif p2_decision == 'd':
-                highlight_path.append(('p1_c', 'cd'))
-        elif p1_decision == 'd':
-            highlight_path.append(('Start', 'p1_d'))
-            if p2_decision == 'c':
-                highlight_path.append(('p1_d', 'dc'))
-            elif p2_decision == 'd':
-                highlight_path.append(('p1_d', 'dd'))
-
-        if show_plot:
-            Games().plot_tree(game_tree, pos, node_labels, highlight_path=highlight_path)
-
-        if p1_decision == 'c' and p2_decision == 'c':
-            return (5, 5)
-        elif p1_decision == 'c' and p2_decision == 'd':
-            return (0, 20)
-        elif p1_decision == 'd' and p2_decision == 'c':
-            return (20, 0)
-        elif p1_decision == 'd' and p2_decision == 'd':
-            return (1, 1)
-        
-    def build_battle_of_sexes(self, m, w, show_plot = False):
-        nodes = [
-            ('Start', {'player': 'm', 'label': 'Start'}), 
-            ('m_f', {'player': 'w'}),
-            ('m_b', {'player': 'w'}), 
-            ('ff', {'payoff': (3, 2)}), 
-            ('fb', {'payoff': (0, 0)}), 
-            ('bf', {'payoff': (0, 0)}), 
-            ('bb', {'payoff': (2, 3)}), 
-        ]
-
-        edges = [
-            ('Start', 'm_f', {'action': 'f'}), 
-            ('Start', 'm_b', {'action': 'b'}), 
-            ('m_f', 'ff', {'action': 'f'}), 
-            ('m_f', 'fb', {'action': 'b'}), 
-            ('m_b', 'bf', {'action': 'f'}), 
-            ('m_b', 'bb', {'action': 'b'}), 
-        ]
-
-        game_tree = self.build_game_tree(nodes, edges)
-
-
-        node_labels = Games().add_labels(game_tree)
-
-        pos = {
-            "Start": (0, 2),
-            "m_f": (-1.5, 1),
-            "m_b": (1.5, 1),
-            "ff": (-2, 0),
-            "fb": (-1, 0),
-            "bf": (1, 0),
-            "bb": (2, 0),
-        }
-
-        highlight_path = []
-        if m == 'f':
-            highlight_path.append(('Start', 'm_f'))
-            if w == 'f':
-                highlight_path.append(('m_f', 'ff'))
-            elif w == 'd':
-                highlight_path.append(('m_f', 'fb'))
-        elif m == 'd':
-            highlight_path.append(('Start', 'm_b'))
-            if w == 'c':
-                highlight_path.append(('m_b', 'bf'))
-            elif m == 'd':
-                highlight_path.append(('m_b', 'bb'))
-                
-        if show_plot:
-            Games().plot_tree(game_tree, pos, node_labels, highlight_path=highlight_path)
-
-        if m=='f' and w=='f':
-            return (3, 2)
-        elif m=='f' and w=='b':
-            return (0, 0)
-        elif m=='b' and w=='f':
-            return (0, 0)
-        elif m=='b' and w=='b':
-            return (2, 3)
-    
-    def build_matching_pennies(self, p1, p2, show_plot):
-        
-        nodes = [
-            ('Start', {'player': 'p1', 'label': 'Start'}), 
-            ('p1_h', {'player': 'p2'}), 
-            ('p1_t', {'player': 'p2'}), 
-            ('hh', {'payoff': (1, -1)}), 
-            ('ht', {'payoff': (-1, 1)}), 
-            ('th', {'payoff': (-1, 1)}), 
-            ('tt', {'payoff': (1, -1)}), 
-        ]
-
-        edges = [
-            ('Start', 'p1_h', {'action': 'h'}), 
-            ('Start', 'p1_t', {'action': 't'}), 
-            ('p1_h', 'hh', {'action': 'h'}),
-            ('p1_h', 'ht', {'action': 't'}),
-            ('p1_t', 'th', {'action': 'h'}),
-            ('p1_t', 'tt', {'action': 't'}),
-        ]
-
-        game_tree = self.build_game_tree(nodes, edges)
-
-        node_labels = self.add_labels(game_tree)
-
-        pos = {
-            "Start": (0, 2),
-            "p1_h": (-1.5, 1),
-            "p1_t": (1.5, 1),
-            "hh": (-2, 0),
-            "ht": (-1, 0),
-            "th": (1, 0),
-            "tt": (2, 0),
-        }
-
-        highlighted_path = []
-        if p1 == 'h':
-            highlighted_path.append(("Start", "p1_h"))
-            if p2== 'h':
-                highlighted_path.append(("p1_h", "hh"))
-            elif p2 == 't':
-                highlighted_path.append(("p1_h", 'ht'))
-        elif p1 == 't':
-            highlighted_path.append(('Start', 'p1_t'))
-            if p2 == 'h':
-                highlighted_path.append(("p1_t", 'th'))
-            elif p2 == 't':
-                highlighted_path.append(("p1_t", 'tt'))
-        
-        if show_plot:
-            Games().plot_tree(game_tree, pos, node_labels, highlighted_path)
+    def play(self, name, *actions, show_plot=False, output=None, **params):
+        # Payoff of one profile of a registered game (see Game_Registry.py),
+        # optionally drawing its tree with the chosen path highlighted
+        game = get_game(name, **params)
+        if output is not None or show_plot:
+            game_tree, pos = game.tree()
+            highlight_path = game.path(*actions)
+            if output is not None:
+                self.plot_tree(game_tree, pos, None, highlight_path=highlight_path, output=output)
+            else:
+                self.plot_tree(game_tree, pos, self.add_labels(game_tree), highlight_path=highlight_path)
+        return game.payoff(*actions)
 
-        if p1 == 'h' and p2 == 'h':
-            return (1, -1)
-        elif p1=='h' and p2 == 't':
-            return (-1, 1)
-        elif p1=='t' and p2 == 'h':
-            return (-1, 1)
-        elif p1 == 't' and p2=='t':
-            return (1, -1)
-        
-    def build_hawk_dove(self, p1, p2, show_plot = False):
+    def simulate(self, name, actions, **params):
+        # Vectorized play of a registered game: actions is an (M, n_players)
+        # array of action labels. Returns (leaves, payoffs, paths) from
+        # GameTree.simulate; GameTree.path_edges(paths[k]) gives the edges to
+        # highlight for row k.
+        return get_game(name, **params).game_tree().simulate(actions)
 
-        nodes = [
-            ('Start', {'player': 'p1', 'label': 'Start'}), 
-            ('p1_h', {'player': 'p2'}),
-            ('p1_d', {'player': 'p2'}), 
-            ('hh', {'payoff': (-5, -5)}), 
-            ('hd', {'payoff': (40, 0)}), 
-            ('dh', {'payoff': (0, 40)}), 
-            ('dd', {'payoff': (20, 20)})
-        ]
+    def build_prisoners_dilemma(self, p1_decision, p2_decision, show_plot=False, output=None):
+        return self.play('prisoners_dilemma', p1_decision, p2_decision, show_plot=show_plot, output=output)
 
-        edges = [
-            ('Start', 'p1_h', {'action': 'h'}), 
-            ('Start', 'p1_d', {'action': 'd'}), 
-            ('p1_h', 'hh', {'action': 'h'}), 
-            ('p1_h', 'hd', {'action': 'd'}), 
-            ('p1_d', 'dh', {'action': 'h'}), 
-            ('p1_d', 'dd', {'action': 'd'}), 
-        ]
+    def build_battle_of_sexes(self, m, w, show_plot = False, output=None):
+        return self.play('battle_of_sexes', m, w, show_plot=show_plot, output=output)
 
-        game_tree = self.build_game_tree(nodes, edges)
-        nodes_labels = self.add_labels(game_tree)
+    def build_matching_pennies(self, p1, p2, show_plot=False, output=None):
+        return self.play('matching_pennies', p1, p2, show_plot=show_plot, output=output)
 
-        pos = {
-            "Start": (0, 2),
-            "p1_h": (-1.5, 1),
-            "p1_d": (1.5, 1),
-            "hh": (-2, 0),
-            "hd": (-1, 0),
-            "dh": (1, 0),
-            "dd": (2, 0),
-        }
+    def build_hawk_dove(self, p1, p2, show_plot = False, output=None, V=40, C=50):
+        return self.play('hawk_dove', p1, p2, show_plot=show_plot, output=output, V=V, C=C)
 
-        highlighted_path = []
-        if p1 == 'h':
-            highlighted_path.append(('Start', 'p1_h'))
-            if p2 == 'h':
-                highlighted_path.append(('p1_h', 'hh'))
-            elif p2 == 'd':
-                highlighted_path.append(('p1_h', 'hd'))
-        elif p1 == 'd':
-            highlighted_path.append(('Start', 'p1_d'))
-            if p2 == 'h':
-                highlighted_path.append(('p1_d', 'dh'))
-            elif p2 == 'd':
-                highlighted_path.append(('p1_d', 'dd'))
-        
-        if show_plot:
-            self.plot_tree(game_tree, pos, nodes_labels, highlighted_path)
-        
-        if p1 == 'h' and p2 == 'h':
-            return (-5, -5)
-        elif p1 == 'h' and p2 == 'd':
-            return (40, 0)
-        elif p1 == 'd' and p2 == 'h':
-            return (0, 40)
-        elif p1 == 'd' and p2 == 'd':
-            return (20, 20)
-        
 
 ##** use this for user input design
 